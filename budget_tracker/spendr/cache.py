@@ -0,0 +1,145 @@
+"""
+Response cache of the spendr GET endpoints.
+
+Cached responses are keyed on the normalized query parameters and on version numbers of the data they
+were computed from. Every resource (expenses, contributions, contributors) has:
+
+- one version per month, bumped by writes to that month,
+- an ``all`` version, bumped by every write, for queries that are not bounded to some months,
+- an ``epoch`` version, bumped by writes that may touch any month such as cascades and imports.
+
+A write never deletes cached responses, it bumps versions so that the keys of the stale responses are
+no longer computed and the entries expire on their own.
+"""
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from budget_tracker.spendr.events import publish_change
+from budget_tracker.spendr.managers import get_month, get_next_month, to_date
+from budget_tracker.spendr.routers import primary_pinned, replica_reads
+
+KEY_PREFIX = "spendr"
+RESPONSE_TIMEOUT = 60 * 60
+# Queries spanning more months than this are cached against the ``all`` version instead
+MAX_SCOPE_MONTHS = 120
+
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+HITS_KEY = f"{KEY_PREFIX}:stats:hits"
+MISSES_KEY = f"{KEY_PREFIX}:stats:misses"
+
+
+def get_version_key(resource, version):
+    return f"{KEY_PREFIX}:version:{resource}:{version}"
+
+
+def get_months_between(start_date, end_date):
+    """
+    Return the first day of every month from ``start_date`` to ``end_date``, or None when unbounded.
+    """
+    if not (start_date and end_date):
+        return None
+
+    months: list[datetime.date] = []
+    month = get_month(start_date)
+    while month <= end_date and len(months) <= MAX_SCOPE_MONTHS:
+        months.append(month)
+        month = get_next_month(month)
+
+    return months if len(months) <= MAX_SCOPE_MONTHS else None
+
+
+def get_version_keys(resource, months=None):
+    if months is None:
+        return [get_version_key(resource, "epoch"), get_version_key(resource, "all")]
+    return [get_version_key(resource, "epoch")] + [get_version_key(resource, month.isoformat()) for month in months]
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the clock so that a version evicted from the cache never comes back with an old value
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_response_cache_key(view_name, query_params, scopes):
+    """
+    Return the cache key of a GET response.
+
+    ``scopes`` is a list of ``(resource, months)`` pairs naming the data the response is computed from,
+    ``months`` being None when the query is not bounded to some months.
+    """
+    keys = [key for resource, months in scopes for key in get_version_keys(resource, months)]
+    params = sorted((key, value) for key in query_params for value in query_params.getlist(key))
+    digest = hashlib.md5(repr((params, get_versions(keys))).encode(), usedforsecurity=False).hexdigest()
+    return f"{KEY_PREFIX}:response:{view_name}:{digest}"
+
+
+def get_cached_response(cache_key):
+    # A response cached before the replicas caught up may miss the recent writes of the user
+    if primary_pinned.get():
+        return None
+
+    cached = cache.get(cache_key)
+    if cached is None:
+        increment(MISSES_KEY)
+        return None
+
+    increment(HITS_KEY)
+    return Response(cached["data"], headers=cached["headers"])
+
+
+def cache_response(cache_key, response):
+    # The rows read from a lagging replica may predate the versions of the key
+    if replica_reads.get():
+        return
+
+    headers = {header: response[header] for header in CACHED_HEADERS if header in response}
+    cache.set(cache_key, {"data": evaluate(response.data), "headers": headers}, RESPONSE_TIMEOUT)
+
+
+def evaluate(data):
+    # Querysets are stored as the rows they return
+    if isinstance(data, dict):
+        return {key: evaluate(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)) or hasattr(data, "iterator"):
+        return [evaluate(value) for value in data]
+    return data
+
+
+def invalidate(resource, dates=None):
+    """
+    Bump the versions of ``resource`` for the months of ``dates`` once the current transaction commits.
+
+    Without ``dates`` every cached response computed from ``resource`` is invalidated. The change is also
+    pushed to the event stream subscribers.
+    """
+    publish_change(resource, dates)
+
+    if dates is None:
+        keys = [get_version_key(resource, "epoch"), get_version_key(resource, "all")]
+    else:
+        months = {get_month(to_date(date)) for date in dates if date is not None}
+        keys = [get_version_key(resource, "all")] + [get_version_key(resource, month.isoformat()) for month in months]
+
+    transaction.on_commit(lambda: [increment(key) for key in keys])
+
+
+def increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns() if ":version:" in key else 1, None)
+
+
+def get_cache_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {"hits": stats.get(HITS_KEY, 0), "misses": stats.get(MISSES_KEY, 0)}
@@ -0,0 +1,49 @@
+"""
+Conditional GET support of the spendr list endpoints.
+
+The validator of a response is the number of rows it is computed from and their latest ``modified``
+timestamp, read with a single aggregate query that the ``modified`` and listing indexes answer without
+reading the table. A new or updated row moves the timestamp and a deleted one changes the count, so the
+ETag changes whenever the response would.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def get_validator_headers(queryset):
+    """
+    Return the ETag and Last-Modified headers of a response computed from ``queryset``.
+    """
+    validator = queryset.order_by().aggregate(last_modified=Max("modified"), count=Count("*"))
+    return build_validator_headers(validator["last_modified"], validator["count"])
+
+
+def get_rows_validator_headers(rows):
+    """
+    Return the ETag and Last-Modified headers of a response computed from already fetched model instances.
+    """
+    return build_validator_headers(max((row.modified for row in rows), default=None), len(rows))
+
+
+def build_validator_headers(last_modified, count):
+    value = f"{last_modified.isoformat() if last_modified else ''}:{count}"
+    headers = {"ETag": quote_etag(hashlib.md5(value.encode(), usedforsecurity=False).hexdigest())}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    return headers
+
+
+def get_not_modified_response(request, headers):
+    """
+    Return a 304 response when the If-None-Match header of the request matches the ETag in ``headers``.
+
+    If-Modified-Since alone is not honoured, a deletion does not move the latest ``modified`` timestamp.
+    """
+    if "ETag" not in headers or not request.headers.get("If-None-Match"):
+        return None
+
+    return get_conditional_response(request, etag=headers["ETag"])
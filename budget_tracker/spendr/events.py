@@ -0,0 +1,213 @@
+"""
+Server-Sent Events push of the spendr changes.
+
+Writes publish a small delta, the resource and the months it touched, on a Redis pub/sub channel once
+their transaction commits. Every ASGI worker keeps one subscription to the channel and fans the deltas
+out to the event streams it serves, so subscribers can be spread over any number of workers.
+
+Deltas are not stored: a client that was disconnected, or that could not keep up, gets a ``resync``
+event and catches up through the ``changes`` endpoint.
+"""
+import asyncio
+import json
+import logging
+from importlib import import_module
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import transaction
+from django.http import HttpRequest
+from django.http.cookie import parse_cookie
+from rest_framework.exceptions import AuthenticationFailed
+
+from budget_tracker.spendr.managers import get_month, to_date
+from budget_tracker.users.authentication import CachedTokenAuthentication
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PATH = "/spendr/events"
+EVENTS_CHANNEL = "spendr:events"
+PUSHED_RESOURCES = ("expenses", "contributions")
+
+# Comment lines keep idle connections open through proxies
+HEARTBEAT_INTERVAL = 15
+RECONNECT_DELAY = 1
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RESYNC = json.dumps({"type": "resync"})
+
+_publisher = None
+
+
+def get_publisher():
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(settings.SPENDR_EVENTS_REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+    return _publisher
+
+
+def get_change_event(resource, dates=None):
+    months = None
+    if dates is not None:
+        months = sorted({get_month(to_date(date)).strftime("%Y-%m") for date in dates if date is not None})
+    return json.dumps({"type": "change", "resource": resource, "months": months})
+
+
+def publish_change(resource, dates=None):
+    """
+    Publish the months of ``dates`` changed in ``resource`` once the current transaction commits.
+
+    Without ``dates`` the change may have touched any month.
+    """
+    if resource not in PUSHED_RESOURCES or not settings.SPENDR_EVENTS_REDIS_URL:
+        return
+
+    event = get_change_event(resource, dates)
+    transaction.on_commit(lambda: send_event(event))
+
+
+def send_event(event):
+    # The write is already committed, a missed push only delays the clients until they resync
+    try:
+        get_publisher().publish(EVENTS_CHANNEL, event)
+    except redis.RedisError:
+        logger.warning("Could not publish a spendr change event", exc_info=True)
+
+
+class Broadcaster:
+    """Fan out the events of the Redis channel to the streams of this worker."""
+
+    def __init__(self):
+        self.queues: set[asyncio.Queue[str]] = set()
+        self.task = None
+
+    def subscribe(self):
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.queues.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.listen())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.queues.discard(queue)
+
+    def put(self, queue, event):
+        if queue.full():
+            # The client is too slow, drop what it has not read and let it catch up from the change feed
+            while not queue.empty():
+                queue.get_nowait()
+            event = RESYNC
+        queue.put_nowait(event)
+
+    def broadcast(self, event):
+        for queue in list(self.queues):
+            self.put(queue, event)
+
+    async def listen(self):
+        while self.queues:
+            client = aioredis.Redis.from_url(settings.SPENDR_EVENTS_REDIS_URL)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(EVENTS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.broadcast(message["data"].decode())
+                        if not self.queues:
+                            return
+            except redis.RedisError:
+                logger.warning("Lost the spendr events subscription, reconnecting", exc_info=True)
+                # Events published while reconnecting are lost
+                self.broadcast(RESYNC)
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await client.close()
+
+
+broadcaster = Broadcaster()
+
+
+def format_event(event):
+    return f"event: {json.loads(event)['type']}\ndata: {event}\n\n".encode()
+
+
+@sync_to_async
+def authenticate(scope):
+    """
+    Return the user of the token or session of the request, like the DRF authentication classes do.
+    """
+    headers = {name.decode("latin1").lower(): value.decode("latin1") for name, value in scope["headers"]}
+
+    keyword, _, key = headers.get("authorization", "").partition(" ")
+    if keyword == "Token":
+        try:
+            user, _ = CachedTokenAuthentication().authenticate_credentials(key.strip())
+        except AuthenticationFailed:
+            return None
+        return user
+
+    request = HttpRequest()
+    request.COOKIES = parse_cookie(headers.get("cookie", ""))
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    user = get_user(request)
+    return user if user.is_authenticated else None
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def stream_events(scope, receive, send):
+    """
+    ASGI application streaming the change events to an authenticated client.
+
+    Served outside of the Django request cycle: Django 4.1 iterates streaming responses synchronously,
+    which would block the event loop for as long as the stream is open.
+    """
+    if scope["method"] != "GET":
+        await send_json(send, 405, {"detail": f'Method "{scope["method"]}" not allowed.'})
+        return
+
+    if await authenticate(scope) is None:
+        await send_json(send, 403, {"detail": "Authentication credentials were not provided."})
+        return
+
+    queue = broadcaster.subscribe()
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"retry: 5000\n\n", "more_body": True})
+
+        while not disconnected.done():
+            event = asyncio.ensure_future(queue.get())
+            await asyncio.wait({event, disconnected}, timeout=HEARTBEAT_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            if event.done():
+                body = format_event(event.result())
+            else:
+                event.cancel()
+                body = b": keepalive\n\n"
+            if not disconnected.done():
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+    finally:
+        broadcaster.unsubscribe(queue)
+        disconnected.cancel()
+
+
+async def send_json(send, status, data):
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": json.dumps(data).encode()})
@@ -0,0 +1,176 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+
+from budget_tracker.spendr.cache import invalidate
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, MonthlyBudgetRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Load historical expenses and contributions from CSV files with COPY. "
+        "Expenses columns: date_added,item_name,item_price,item_quantity,added_by. "
+        "Contributions columns: contribution_date,contributor,contribution_amount. "
+        "Both files need a header row."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--expenses", help="Path of the expenses CSV file")
+        parser.add_argument("--contributions", help="Path of the contributions CSV file")
+
+    def handle(self, *args, **options):
+        if not (options["expenses"] or options["contributions"]):
+            raise CommandError("Provide --expenses and/or --contributions")
+
+        if connection.vendor != "postgresql":
+            raise CommandError("import_ledger needs a PostgreSQL database")
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                months = set()
+                if options["expenses"]:
+                    months |= self.import_file(cursor, options["expenses"], "expenses", self.load_expenses)
+                if options["contributions"]:
+                    months |= self.import_file(
+                        cursor, options["contributions"], "contributions", self.load_contributions
+                    )
+
+                # The rows are inserted in SQL, bypassing the model methods maintaining the rollups
+                MonthlyBudgetRollup.objects.refresh_months(months)
+                for resource in ("expenses", "contributions", "contributors"):
+                    invalidate(resource)
+        except (OSError, DatabaseError) as error:
+            raise CommandError(f"Import failed, nothing has been saved: {error}")
+
+    def import_file(self, cursor, path, label, load):
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as file:
+            rows, months = load(cursor, file)
+        elapsed = time.perf_counter() - start
+
+        rate = rows / elapsed if elapsed else rows
+        self.stdout.write(self.style.SUCCESS(f"Imported {rows} {label} in {elapsed:.2f}s ({rate:.0f} rows/s)"))
+        return months
+
+    def copy(self, cursor, sql, file):
+        # copy_expert() is psycopg2's own method, translate its errors like Django does for execute()
+        with connection.wrap_database_errors:
+            cursor.copy_expert(sql, file)
+
+    def load_expenses(self, cursor, file):
+        cursor.execute(
+            """
+            CREATE TEMPORARY TABLE expenses_staging (
+                date_added date,
+                item_name text,
+                item_price integer,
+                item_quantity integer,
+                added_by text
+            ) ON COMMIT DROP
+            """
+        )
+        self.copy(
+            cursor,
+            "COPY expenses_staging (date_added, item_name, item_price, item_quantity, added_by) "
+            "FROM STDIN WITH (FORMAT csv, HEADER true)",
+            file,
+        )
+        # Same rules as Expenses.save(): lowercase item names, total_price is set by the table trigger
+        cursor.execute(
+            f"""
+            INSERT INTO {Expenses._meta.db_table}
+                (created, modified, added_by, date_added, item_name, item_price, item_quantity, unique_id)
+            SELECT
+                NOW(),
+                NOW(),
+                added_by,
+                COALESCE(date_added, CURRENT_DATE),
+                LOWER(item_name),
+                item_price,
+                COALESCE(item_quantity, 1),
+                GEN_RANDOM_UUID()
+            FROM expenses_staging
+            """
+        )
+        rows = cursor.rowcount
+        cursor.execute("SELECT DISTINCT COALESCE(date_added, CURRENT_DATE) FROM expenses_staging")
+        return rows, {date for date, in cursor.fetchall()}
+
+    def load_contributions(self, cursor, file):
+        cursor.execute(
+            """
+            CREATE TEMPORARY TABLE contributions_staging (
+                contribution_date date,
+                contributor text,
+                contribution_amount integer
+            ) ON COMMIT DROP
+            """
+        )
+        self.copy(
+            cursor,
+            "COPY contributions_staging (contribution_date, contributor, contribution_amount) "
+            "FROM STDIN WITH (FORMAT csv, HEADER true)",
+            file,
+        )
+        # Contributors are stored lowercased, create the missing ones in one statement. Deleted contributors
+        # waiting to be purged do not count, a new contributor of the same name is created. Rows without a
+        # contributor name or a date are skipped, Contributions.save() never stores them.
+        cursor.execute(
+            f"""
+            INSERT INTO {Contributors._meta.db_table} (created, modified, name)
+            SELECT NOW(), NOW(), name
+            FROM (
+                SELECT DISTINCT LOWER(contributor) AS name
+                FROM contributions_staging
+                WHERE contribution_date IS NOT NULL
+            ) AS names
+            WHERE BTRIM(name) <> '' AND NOT EXISTS (
+                SELECT 1 FROM {Contributors._meta.db_table} WHERE name = names.name AND deleted_at IS NULL
+            )
+            """
+        )
+        # Contributions always fall on the first day of their month, as in Contributions.save()
+        cursor.execute(
+            f"""
+            INSERT INTO {Contributions._meta.db_table}
+                (
+                    created,
+                    modified,
+                    contributor_id,
+                    contribution_date,
+                    contribution_amount,
+                    unique_id,
+                    contributor_name,
+                    year_month
+                )
+            SELECT
+                NOW(),
+                NOW(),
+                contributors.id,
+                DATE_TRUNC('month', staging.contribution_date)::date,
+                staging.contribution_amount,
+                GEN_RANDOM_UUID(),
+                INITCAP(contributors.name),
+                TO_CHAR(staging.contribution_date, 'YYYY-MM')
+            FROM contributions_staging AS staging
+            JOIN (
+                SELECT name, MIN(id) AS id FROM {Contributors._meta.db_table} WHERE deleted_at IS NULL GROUP BY name
+            ) AS contributors ON contributors.name = LOWER(staging.contributor)
+            WHERE staging.contribution_date IS NOT NULL
+            """
+        )
+        rows = cursor.rowcount
+        cursor.execute("SELECT COUNT(*) FILTER (WHERE contribution_date IS NULL), COUNT(*) FROM contributions_staging")
+        undated, staged = cursor.fetchone()
+        if undated:
+            self.stdout.write(self.style.WARNING(f"Skipped {undated} contributions without a date"))
+        if staged - undated > rows:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {staged - undated - rows} contributions without a contributor")
+            )
+
+        cursor.execute(
+            "SELECT DISTINCT contribution_date FROM contributions_staging WHERE contribution_date IS NOT NULL"
+        )
+        return rows, {date for date, in cursor.fetchall()}
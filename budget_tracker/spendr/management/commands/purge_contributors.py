@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from budget_tracker.spendr.models import ContributorPurge
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the contributions of deleted contributors in bounded batches, then the contributors. "
+        "Progress is visible at /spendr/contributors/purges."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Contributions deleted per transaction")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to wait between batches")
+        parser.add_argument(
+            "--watch", type=float, metavar="SECONDS", help="Keep running, looking for new purges every SECONDS"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for purge in ContributorPurge.objects.filter(finished=None).order_by("pk"):
+                self.run(purge, options["batch_size"], options["pause"])
+
+            if options["watch"] is None:
+                return
+            time.sleep(options["watch"])
+
+    def run(self, purge, batch_size, pause):
+        purged = purge.purged_contributions
+        while True:
+            deleted = ContributorPurge.objects.purge_batch(purge, batch_size)
+            if not deleted:
+                break
+            purged += deleted
+            self.stdout.write(f"{purge.name}: {purged}/{purge.total_contributions} contributions purged")
+            time.sleep(pause)
+
+        self.stdout.write(self.style.SUCCESS(f"Purged contributor {purge.name}"))
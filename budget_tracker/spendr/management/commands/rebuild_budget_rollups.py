@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from budget_tracker.spendr.models import MonthlyBudgetRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly budget rollups from the expenses and contributions tables."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            months = MonthlyBudgetRollup.objects.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt budget rollups for {months} months"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from budget_tracker.spendr.cache import get_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show the hit and miss counters of the spendr response cache."
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] * 100 / total if total else 0
+
+        self.stdout.write(f"hits: {stats['hits']}, misses: {stats['misses']}, hit ratio: {ratio:.1f}%")
@@ -0,0 +1,121 @@
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+DEFAULT_PATHS = (
+    "/spendr/budget_status?year_month=2023-01",
+    "/spendr/expenses?start_date=2023-01-01&end_date=2023-12-31&page_size=100",
+    "/spendr/contributions?start_year_month=2023-01&end_year_month=2023-12&page_size=100",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to running servers and report their p50/p99 latency, "
+        "e.g. to compare the WSGI and ASGI deployments: "
+        "spendr_load_test wsgi=http://localhost:8000 asgi=http://localhost:8001 --token <token>"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("servers", nargs="+", help="Servers to compare, as name=base_url")
+        parser.add_argument("--token", required=True, help="DRF token of the user sending the requests")
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request, can be repeated")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests sent to each server")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at the same time")
+        parser.add_argument(
+            "--count-connections",
+            action="store_true",
+            help="Sample the connections open to the database of the settings while the requests run",
+        )
+
+    def handle(self, *args, **options):
+        servers = []
+        for server in options["servers"]:
+            name, _, base_url = server.partition("=")
+            if not base_url:
+                raise CommandError(f"Give servers as name=base_url, not {server}")
+            servers.append((name, base_url.rstrip("/")))
+
+        paths = options["paths"] or DEFAULT_PATHS
+        headers = {"Authorization": f"Token {options['token']}"}
+
+        for name, base_url in servers:
+            urls = [base_url + paths[number % len(paths)] for number in range(options["requests"])]
+            # Warm up the connections and the server caches before measuring
+            self.run(urls[: options["concurrency"]], headers, options["concurrency"])
+
+            sampler = ConnectionSampler() if options["count_connections"] else None
+            if sampler:
+                sampler.start()
+            start = time.perf_counter()
+            latencies, errors = self.run(urls, headers, options["concurrency"])
+            elapsed = time.perf_counter() - start
+            if sampler:
+                sampler.stop()
+
+            self.report(name, latencies, errors, elapsed)
+            if sampler and sampler.counts:
+                self.stdout.write(
+                    f"{name}: {max(sampler.counts)} database connections at most, "
+                    f"{statistics.mean(sampler.counts):.1f} on average"
+                )
+
+    def run(self, urls, headers, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda url: self.request(url, headers), urls))
+        return [latency for latency in results if latency is not None], results.count(None)
+
+    def request(self, url, headers):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            return None
+        return time.perf_counter() - start
+
+    def report(self, name, latencies, errors, elapsed):
+        if len(latencies) < 2:
+            self.stdout.write(self.style.ERROR(f"{name}: {errors} errors, not enough successful requests"))
+            return
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name}: {len(latencies)} requests, {errors} errors, {len(latencies) / elapsed:.0f} req/s, "
+            f"p50 {percentiles[49] * 1000:.1f}ms, p99 {percentiles[98] * 1000:.1f}ms"
+        )
+
+
+class ConnectionSampler(threading.Thread):
+    """
+    Count the client connections open to the database every ``interval`` seconds, leaving out its own and
+    the parallel query workers.
+    """
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.counts = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.wait(self.interval):
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM pg_stat_activity WHERE datname = current_database() "
+                        "AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+                    )
+                    self.counts.append(cursor.fetchone()[0])
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
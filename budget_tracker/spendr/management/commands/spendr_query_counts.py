@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from budget_tracker.spendr.management.commands.spendr_load_test import DEFAULT_PATHS
+from budget_tracker.users.authentication import invalidate_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the queries run by GET requests served in process, with the token not cached yet and then "
+        "cached, and how many of them authenticate the request: spendr_query_counts --token <token>"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--token", required=True, help="DRF token of the user sending the requests")
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request, can be repeated")
+        parser.add_argument("--host", default="localhost", help="Host header, one of the ALLOWED_HOSTS")
+
+    def handle(self, *args, **options):
+        if not Token.objects.filter(key=options["token"]).exists():
+            raise CommandError("Unknown token")
+
+        client = Client(HTTP_AUTHORIZATION=f"Token {options['token']}", HTTP_HOST=options["host"])
+        for path in options["paths"] or DEFAULT_PATHS:
+            invalidate_tokens([options["token"]])
+            cold = self.count(client, path)
+            warm = self.count(client, path)
+            self.stdout.write(
+                f"{path}: {cold[0]} queries ({cold[1]} authentication) with the token not cached, "
+                f"{warm[0]} queries ({warm[1]} authentication) cached"
+            )
+
+    def count(self, client, path):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f"{path} answered {response.status_code}")
+
+        queries = [query["sql"] for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]
+        return len(queries), len([sql for sql in queries if "authtoken_token" in sql])
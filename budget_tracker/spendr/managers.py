@@ -0,0 +1,218 @@
+import datetime
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def get_month(date):
+    if isinstance(date, datetime.datetime):
+        date = date.date()
+    return date.replace(day=1)
+
+
+def to_date(date):
+    if isinstance(date, str):
+        return datetime.date.fromisoformat(date)
+    return date
+
+
+DELETED_CONTRIBUTORS_KEY = "spendr:contributors:deleted"
+DELETED_CONTRIBUTORS_TIMEOUT = 60
+# Stored instead of the ids while a transaction deleting contributors runs
+DELETING_CONTRIBUTORS = "deleting"
+
+
+def get_deleted_contributor_ids():
+    """
+    Return the ids of the deleted contributors waiting to be purged, cached for every worker.
+
+    The ids are read from the primary, a lagging replica would have the contributions of a contributor
+    just deleted show up again until the entry expires. They are not cached while contributors are being
+    deleted, the transaction may still be rolled back.
+    """
+    ids = cache.get(DELETED_CONTRIBUTORS_KEY)
+    if ids is None or ids == DELETING_CONTRIBUTORS:
+        contributors_model = apps.get_model("spendr", "Contributors")
+        deleted = list(
+            contributors_model.all_objects.using(DEFAULT_DB_ALIAS)
+            .exclude(deleted_at=None)
+            .values_list("pk", flat=True)
+        )
+        if ids is None:
+            cache.add(DELETED_CONTRIBUTORS_KEY, deleted, DELETED_CONTRIBUTORS_TIMEOUT)
+        ids = deleted
+    return ids
+
+
+def forget_deleted_contributors():
+    """
+    Stop caching the ids of the deleted contributors until the current transaction commits.
+
+    The entry expires on its own if the transaction is rolled back.
+    """
+    cache.set(DELETED_CONTRIBUTORS_KEY, DELETING_CONTRIBUTORS, DELETED_CONTRIBUTORS_TIMEOUT)
+    transaction.on_commit(lambda: cache.delete(DELETED_CONTRIBUTORS_KEY))
+
+
+def get_next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def get_months_query(field, months):
+    query = Q()
+    for month in months:
+        query = query | Q(**{f"{field}__gte": month, f"{field}__lt": get_next_month(month)})
+    return query
+
+
+class ContributorManager(models.Manager):
+    """Default manager of the contributors, leaving out the deleted ones waiting to be purged."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
+
+
+class ContributionManager(models.Manager):
+    """Default manager of the contributions, leaving out those of deleted contributors waiting to be purged."""
+
+    def get_queryset(self):
+        # A list of ids rather than a subquery, the contributions queries do not read the contributors table
+        deleted_ids = get_deleted_contributor_ids()
+        queryset = super().get_queryset()
+        return queryset.exclude(contributor_id__in=deleted_ids) if deleted_ids else queryset
+
+
+EMPTY_TOTALS = {"total_expenses": 0, "total_contribution": 0, "expense_count": 0, "contribution_count": 0}
+
+
+class MonthlyBudgetRollupManager(models.Manager):
+    """Manager keeping the per month expenses and contribution totals in sync."""
+
+    def add_to_month(self, date, total_expenses=0, total_contribution=0, expense_count=0, contribution_count=0):
+        """
+        Add the given amounts and row counts, which may be negative, to the rollup of the month of ``date``.
+        """
+        if date is None or not (total_expenses or total_contribution or expense_count or contribution_count):
+            return
+
+        month = get_month(date)
+        self.get_or_create(month=month)
+        self.filter(month=month).update(
+            total_expenses=F("total_expenses") + total_expenses,
+            total_contribution=F("total_contribution") + total_contribution,
+            expense_count=F("expense_count") + expense_count,
+            contribution_count=F("contribution_count") + contribution_count,
+            modified=timezone.now(),
+        )
+
+    def refresh_months(self, dates):
+        """
+        Recompute the rollups of the months of ``dates`` from the expenses and contributions tables.
+
+        Used by the write paths that bypass ``Model.save()`` and ``Model.delete()``, such as bulk inserts,
+        queryset deletes and cascades.
+        """
+        months = {get_month(date) for date in dates if date is not None}
+        if not months:
+            return
+
+        self._write_totals(months, self._get_totals(months))
+
+    def rebuild(self):
+        """
+        Recompute every rollup from scratch, returns the number of months written.
+        """
+        totals = self._get_totals()
+        self.all().delete()
+        self._write_totals(totals.keys(), totals)
+        return len(totals)
+
+    def _get_totals(self, months=None):
+        expenses_model = apps.get_model("spendr", "Expenses")
+        contributions_model = apps.get_model("spendr", "Contributions")
+
+        expenses_qs = expenses_model.objects.all()
+        contributions_qs = contributions_model.objects.exclude(contribution_date=None)
+        if months is not None:
+            expenses_qs = expenses_qs.filter(get_months_query("date_added", months))
+            contributions_qs = contributions_qs.filter(get_months_query("contribution_date", months))
+
+        expenses = (
+            expenses_qs.annotate(month=TruncMonth("date_added"))
+            .order_by()
+            .values("month")
+            .annotate(total=Sum("total_price"), count=Count("pk"))
+            .values_list("month", "total", "count")
+        )
+        contributions = (
+            contributions_qs.annotate(month=TruncMonth("contribution_date"))
+            .order_by()
+            .values("month")
+            .annotate(total=Sum("contribution_amount"), count=Count("pk"))
+            .values_list("month", "total", "count")
+        )
+
+        totals: dict[datetime.date, dict[str, int]] = {}
+        for month, total, count in expenses:
+            totals.setdefault(month, dict(EMPTY_TOTALS)).update(total_expenses=total or 0, expense_count=count)
+        for month, total, count in contributions:
+            totals.setdefault(month, dict(EMPTY_TOTALS)).update(
+                total_contribution=total or 0, contribution_count=count
+            )
+
+        return totals
+
+    def _write_totals(self, months, totals):
+        rollups = [self.model(month=month, **totals.get(month, EMPTY_TOTALS)) for month in months]
+        self.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=["month"],
+            update_fields=[*EMPTY_TOTALS, "modified"],
+        )
+
+
+class TombstoneManager(models.Manager):
+    """Manager recording deletions for the change feed."""
+
+    def record(self, resource, keys):
+        self.bulk_create([self.model(resource=resource, key=str(key)) for key in keys], batch_size=1000)
+
+
+class ContributorPurgeManager(models.Manager):
+    """Manager removing the rows of deleted contributors in bounded batches."""
+
+    def purge_batch(self, purge, batch_size):
+        """
+        Delete up to ``batch_size`` contributions of the contributor of ``purge`` in a transaction of their own,
+        or the contributor itself once none is left. Returns the number of contributions deleted.
+        """
+        contributors_model = apps.get_model("spendr", "Contributors")
+        contributions_model = apps.get_model("spendr", "Contributions")
+        tombstone_model = apps.get_model("spendr", "Tombstone")
+
+        with transaction.atomic():
+            rows = list(
+                contributions_model.all_objects.filter(contributor_id=purge.contributor_id)
+                .order_by("pk")
+                .values_list("pk", "unique_id")[:batch_size]
+            )
+            if rows:
+                # The contributions are hidden since the contributor was deleted, the rollups already left them out
+                contributions_model.all_objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+                tombstone_model.objects.record("contributions", [unique_id for _, unique_id in rows])
+                self.filter(pk=purge.pk).update(
+                    purged_contributions=F("purged_contributions") + len(rows), modified=timezone.now()
+                )
+            else:
+                contributors_model.all_objects.filter(pk=purge.contributor_id).delete()
+                forget_deleted_contributors()
+                self.filter(pk=purge.pk).update(finished=timezone.now(), modified=timezone.now())
+
+        return len(rows)
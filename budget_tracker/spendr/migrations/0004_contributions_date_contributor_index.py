@@ -0,0 +1,16 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0003_alter_expenses_date_added"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(fields=["contribution_date", "contributor"], name="contribution_date_contrib_idx"),
+        ),
+    ]
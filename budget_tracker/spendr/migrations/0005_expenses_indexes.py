@@ -0,0 +1,35 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0004_contributions_date_contributor_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="contributors",
+            name="name",
+            field=models.CharField(db_index=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["-date_added", "-total_price"],
+                include=("item_name", "item_price", "item_quantity", "added_by", "unique_id"),
+                name="expense_date_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["item_name", "-date_added", "-total_price"], name="expense_item_date_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(fields=["added_by", "-date_added", "-total_price"], name="expense_added_by_date_idx"),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:14
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0005_expenses_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyBudgetRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                ("month", models.DateField(unique=True)),
+                ("total_expenses", models.BigIntegerField(default=0)),
+                ("total_contribution", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO spendr_monthlybudgetrollup (created, modified, month, total_expenses, total_contribution)
+                SELECT NOW(), NOW(), month, SUM(expenses), SUM(contribution)
+                FROM (
+                    SELECT DATE_TRUNC('month', date_added)::date AS month, total_price AS expenses, 0 AS contribution
+                    FROM spendr_expenses
+                    UNION ALL
+                    SELECT DATE_TRUNC('month', contribution_date)::date, 0, COALESCE(contribution_amount, 0)
+                    FROM spendr_contributions
+                    WHERE contribution_date IS NOT NULL
+                ) AS amounts
+                GROUP BY month
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
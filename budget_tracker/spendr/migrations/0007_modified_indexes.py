@@ -0,0 +1,24 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0006_monthlybudgetrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(fields=["modified"], name="contribution_modified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contributors",
+            index=models.Index(fields=["modified"], name="contributor_modified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(fields=["modified"], name="expense_modified_idx"),
+        ),
+    ]
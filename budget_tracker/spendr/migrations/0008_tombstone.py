@@ -0,0 +1,38 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:23
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0007_modified_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                ("resource", models.CharField(max_length=25)),
+                ("key", models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["modified", "id"], name="tombstone_modified_idx"),
+        ),
+    ]
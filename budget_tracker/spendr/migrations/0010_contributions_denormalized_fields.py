@@ -0,0 +1,49 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill(apps, schema_editor):
+    # One UPDATE per range of ids, each committed on its own so that no lock is held for the whole table
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM spendr_contributions")
+        first_id, last_id = cursor.fetchone()
+        if first_id is None:
+            return
+
+        for start in range(first_id, last_id + 1, BACKFILL_BATCH_SIZE):
+            cursor.execute(
+                """
+                UPDATE spendr_contributions AS contributions
+                SET contributor_name = INITCAP(contributors.name),
+                    year_month = TO_CHAR(contributions.contribution_date, 'YYYY-MM')
+                FROM spendr_contributors AS contributors
+                WHERE contributors.id = contributions.contributor_id
+                    AND contributions.id >= %s AND contributions.id < %s
+                """,
+                [start, start + BACKFILL_BATCH_SIZE],
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("spendr", "0009_contributor_soft_delete"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contributions",
+            name="contributor_name",
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="contributions",
+            name="year_month",
+            field=models.CharField(max_length=7, null=True),
+        ),
+        migrations.RunPython(backfill, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.1.8 on 2026-10-18 20:42
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+CREATE_TRIGGER = """
+    CREATE FUNCTION spendr_expenses_total_price() RETURNS trigger AS $$
+    BEGIN
+        NEW.total_price := NEW.item_price * NEW.item_quantity;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER spendr_expenses_total_price
+    BEFORE INSERT OR UPDATE OF item_price, item_quantity, total_price ON spendr_expenses
+    FOR EACH ROW EXECUTE FUNCTION spendr_expenses_total_price();
+"""
+
+DROP_TRIGGER = """
+    DROP TRIGGER spendr_expenses_total_price ON spendr_expenses;
+    DROP FUNCTION spendr_expenses_total_price();
+"""
+
+
+def backfill(apps, schema_editor):
+    # Rows written by bulk paths before the trigger existed, and the rollups of their months
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH fixed AS (
+                UPDATE spendr_expenses
+                SET total_price = item_price * item_quantity
+                WHERE total_price IS DISTINCT FROM item_price * item_quantity
+                RETURNING date_added
+            )
+            SELECT DISTINCT DATE_TRUNC('month', date_added)::date FROM fixed
+            """
+        )
+        months = [month for month, in cursor.fetchall()]
+        if not months:
+            return
+
+        cursor.execute(
+            """
+            UPDATE spendr_monthlybudgetrollup AS rollup
+            SET total_expenses = COALESCE(
+                    (
+                        SELECT SUM(total_price) FROM spendr_expenses
+                        WHERE date_added >= rollup.month AND date_added < rollup.month + INTERVAL '1 month'
+                    ),
+                    0
+                ),
+                modified = NOW()
+            WHERE rollup.month = ANY(%s)
+            """,
+            [months],
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0010_contributions_denormalized_fields"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+        migrations.RunPython(backfill, reverse_code=migrations.RunPython.noop),
+        # Adding the constraint checks every existing row, verifying the backfill
+        migrations.AlterField(
+            model_name="expenses",
+            name="total_price",
+            field=models.PositiveIntegerField(editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name="expenses",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    (
+                        "total_price",
+                        django.db.models.expressions.CombinedExpression(
+                            models.F("item_price"), "*", models.F("item_quantity")
+                        ),
+                    )
+                ),
+                name="expense_total_price_check",
+            ),
+        ),
+    ]
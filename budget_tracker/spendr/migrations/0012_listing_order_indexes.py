@@ -0,0 +1,48 @@
+# Generated by Django 4.1.8 on 2026-10-18 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0011_expenses_total_price_trigger"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_date_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_item_date_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_added_by_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(fields=["-contribution_date", "unique_id"], name="contribution_listing_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["-date_added", "-total_price", "unique_id"],
+                include=("item_name", "item_price", "item_quantity", "added_by"),
+                name="expense_date_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["item_name", "-date_added", "-total_price", "unique_id"], name="expense_item_date_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["added_by", "-date_added", "-total_price", "unique_id"], name="expense_added_by_date_idx"
+            ),
+        ),
+    ]
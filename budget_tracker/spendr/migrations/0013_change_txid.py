@@ -0,0 +1,79 @@
+# Generated by Django 4.1.8 on 2026-10-18 21:32
+
+from django.db import migrations, models
+
+TABLES = ("spendr_expenses", "spendr_contributions", "spendr_contributors", "spendr_tombstone")
+
+CREATE_TRIGGERS = """
+    CREATE FUNCTION spendr_change_txid() RETURNS trigger AS $$
+    BEGIN
+        NEW.txid := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+""" + "".join(
+    f"""
+    CREATE TRIGGER spendr_change_txid BEFORE INSERT OR UPDATE ON {table}
+    FOR EACH ROW EXECUTE FUNCTION spendr_change_txid();
+    """
+    for table in TABLES
+)
+
+DROP_TRIGGERS = "".join(f"DROP TRIGGER spendr_change_txid ON {table};" for table in TABLES) + (
+    "DROP FUNCTION spendr_change_txid();"
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0012_listing_order_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="tombstone",
+            name="tombstone_modified_idx",
+        ),
+        migrations.AddField(
+            model_name="contributions",
+            name="txid",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="contributors",
+            name="txid",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="expenses",
+            name="txid",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="txid",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        # The existing rows keep txid 0, they come first in the feed
+        migrations.RunSQL(sql=CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(fields=["txid", "id"], name="contribution_txid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contributors",
+            index=models.Index(fields=["txid", "id"], name="contributor_txid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(fields=["txid", "id"], name="expense_txid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["txid", "id"], name="tombstone_txid_idx"),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.1.8 on 2026-10-18 22:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0013_change_txid"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="contributions",
+            name="contribution_modified_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="contributions",
+            name="contribution_listing_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="contributors",
+            name="contributor_modified_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_date_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_item_date_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="expenses",
+            name="expense_added_by_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(
+                fields=["-contribution_date", "unique_id"],
+                include=("contributor", "modified"),
+                name="contribution_listing_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contributions",
+            index=models.Index(fields=["modified"], include=("contributor",), name="contribution_modified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contributors",
+            index=models.Index(fields=["modified"], include=("deleted_at",), name="contributor_modified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["-date_added", "-total_price", "unique_id"],
+                include=("item_name", "item_price", "item_quantity", "added_by", "modified"),
+                name="expense_date_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["item_name", "-date_added", "-total_price", "unique_id"],
+                include=("modified",),
+                name="expense_item_date_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expenses",
+            index=models.Index(
+                fields=["added_by", "-date_added", "-total_price", "unique_id"],
+                include=("modified",),
+                name="expense_added_by_date_idx",
+            ),
+        ),
+    ]
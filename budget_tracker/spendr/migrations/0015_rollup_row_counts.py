@@ -0,0 +1,42 @@
+# Generated by Django 4.1.8 on 2026-10-18 22:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spendr", "0014_validator_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monthlybudgetrollup",
+            name="contribution_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="monthlybudgetrollup",
+            name="expense_count",
+            field=models.IntegerField(default=0),
+        ),
+        # The contributions of the deleted contributors waiting to be purged are left out, as in the totals
+        migrations.RunSQL(
+            sql="""
+                UPDATE spendr_monthlybudgetrollup AS rollup
+                SET
+                    expense_count = (
+                        SELECT COUNT(*) FROM spendr_expenses
+                        WHERE date_added >= rollup.month AND date_added < rollup.month + INTERVAL '1 month'
+                    ),
+                    contribution_count = (
+                        SELECT COUNT(*) FROM spendr_contributions
+                        WHERE contribution_date >= rollup.month
+                            AND contribution_date < rollup.month + INTERVAL '1 month'
+                            AND contributor_id NOT IN (
+                                SELECT id FROM spendr_contributors WHERE deleted_at IS NOT NULL
+                            )
+                    )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,12 +1,98 @@
 import datetime
+import re
 import uuid
 
 from django.db import models
+from django.db.models import Count, F, Q
+from django.utils import timezone
 from model_utils.models import TimeStampedModel
 
+from budget_tracker.spendr.cache import invalidate
+from budget_tracker.spendr.managers import (
+    ContributionManager,
+    ContributorManager,
+    ContributorPurgeManager,
+    MonthlyBudgetRollupManager,
+    TombstoneManager,
+    forget_deleted_contributors,
+)
+
+
+def get_display_name(name):
+    """
+    Return a contributor name the way Postgres INITCAP() capitalizes it, every word capitalized.
+    """
+    if name is None:
+        return None
+    return re.sub(r"[^\W_]+", lambda word: word.group().capitalize(), name)
+
 
 class Contributors(TimeStampedModel):
-    name = models.CharField(max_length=255, null=True)
+    name = models.CharField(max_length=255, null=True, db_index=True)
+    # Set when the contributor is deleted, the rows are then purged in the background
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    # Transaction that last wrote the row, set by the spendr_change_txid trigger and read by the change feed
+    txid = models.BigIntegerField(editable=False)
+
+    objects: ContributorManager = ContributorManager()
+    all_objects: models.Manager = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Serves the conditional GET validator of the listing, see get_validator_headers()
+            models.Index(fields=["modified"], include=["deleted_at"], name="contributor_modified_idx"),
+            models.Index(fields=["txid", "id"], name="contributor_txid_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        previous_name = None
+        update_fields = kwargs.get("update_fields")
+        renaming = not self._state.adding and (update_fields is None or "name" in update_fields)
+        if renaming:
+            previous_name = Contributors.all_objects.filter(pk=self.pk).values_list("name", flat=True).first()
+
+        super().save(*args, **kwargs)
+
+        # The contributions carry a copy of the display name
+        if renaming and previous_name != self.name:
+            Contributions.all_objects.filter(contributor=self).update(
+                contributor_name=get_display_name(self.name), modified=timezone.now()
+            )
+            invalidate("contributions")
+
+    def soft_delete(self):
+        """
+        Hide the contributor and its contributions at once and queue the purge of their rows.
+        """
+        months = dict(
+            Contributions.all_objects.filter(contributor=self)
+            .order_by()
+            .values("contribution_date")
+            .annotate(count=Count("pk"))
+            .values_list("contribution_date", "count")
+        )
+
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted_at"])
+        forget_deleted_contributors()
+
+        # The rollups no longer count the contributions of the contributor
+        MonthlyBudgetRollup.objects.refresh_months(months)
+        Tombstone.objects.record("contributors", [self.name])
+        return ContributorPurge.objects.create(
+            contributor=self, name=self.name, total_contributions=sum(months.values())
+        )
+
+    def delete(self, *args, **kwargs):
+        # The contributions are removed by the cascade, which does not go through Contributions.delete()
+        contributions = list(
+            Contributions.all_objects.filter(contributor=self).values_list("unique_id", "contribution_date")
+        )
+        result = super().delete(*args, **kwargs)
+        MonthlyBudgetRollup.objects.refresh_months({date for _, date in contributions})
+        Tombstone.objects.record("contributors", [self.name])
+        Tombstone.objects.record("contributions", [unique_id for unique_id, _ in contributions])
+        return result
 
 
 class Contributions(TimeStampedModel):
@@ -14,13 +100,65 @@ class Contributions(TimeStampedModel):
     contribution_date = models.DateField(null=True)
     contribution_amount = models.PositiveIntegerField(null=True)
     unique_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    # Copies of the contributor display name and of the date as YYYY-MM, read by the listings
+    contributor_name = models.CharField(max_length=255, null=True)
+    year_month = models.CharField(max_length=7, null=True)
+    txid = models.BigIntegerField(editable=False)
+
+    objects: ContributionManager = ContributionManager()
+    all_objects: models.Manager = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["contribution_date", "contributor"], name="contribution_date_contrib_idx"),
+            # Serves the listing order and its keyset pages, and the validator of date ranges
+            models.Index(
+                fields=["-contribution_date", "unique_id"],
+                include=["contributor", "modified"],
+                name="contribution_listing_idx",
+            ),
+            models.Index(fields=["modified"], include=["contributor"], name="contribution_modified_idx"),
+            models.Index(fields=["txid", "id"], name="contribution_txid_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         month = int(kwargs.pop("month"))
         year = datetime.date.today().year
-        self.contribution_date = datetime.datetime(year, month, 1)
+        previous = None
+        if not self._state.adding:
+            previous = (
+                Contributions.objects.filter(pk=self.pk).values("contribution_date", "contribution_amount").first()
+            )
+
+        self.contribution_date = datetime.date(year, month, 1)
+        self.denormalize()
         super().save(*args, **kwargs)
 
+        if previous:
+            MonthlyBudgetRollup.objects.add_to_month(
+                previous["contribution_date"],
+                total_contribution=-(previous["contribution_amount"] or 0),
+                contribution_count=-1,
+            )
+        MonthlyBudgetRollup.objects.add_to_month(
+            self.contribution_date, total_contribution=int(self.contribution_amount or 0), contribution_count=1
+        )
+
+    def denormalize(self):
+        """
+        Set the copied fields, which bulk inserts must call as they do not go through save().
+        """
+        self.contributor_name = get_display_name(self.contributor.name)
+        self.year_month = self.contribution_date.strftime("%Y-%m") if self.contribution_date else None
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        MonthlyBudgetRollup.objects.add_to_month(
+            self.contribution_date, total_contribution=-int(self.contribution_amount or 0), contribution_count=-1
+        )
+        Tombstone.objects.record("contributions", [self.unique_id])
+        return result
+
 
 class Expenses(TimeStampedModel):
     added_by = models.CharField(max_length=25)
@@ -28,9 +166,110 @@ class Expenses(TimeStampedModel):
     item_name = models.CharField(max_length=255)
     item_price = models.PositiveIntegerField()
     item_quantity = models.PositiveIntegerField(default=1)
-    total_price = models.PositiveIntegerField()
+    # Set by the spendr_expenses_total_price trigger on every insert and update, bulk ones included
+    total_price = models.PositiveIntegerField(editable=False)
     unique_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    txid = models.BigIntegerField(editable=False)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=Q(total_price=F("item_price") * F("item_quantity")), name="expense_total_price_check"
+            ),
+        ]
+        indexes = [
+            # Serves the default listing order and date_added ranges, covering the listed columns.
+            models.Index(
+                fields=["-date_added", "-total_price", "unique_id"],
+                include=["item_name", "item_price", "item_quantity", "added_by", "modified"],
+                name="expense_date_price_idx",
+            ),
+            models.Index(
+                fields=["item_name", "-date_added", "-total_price", "unique_id"],
+                include=["modified"],
+                name="expense_item_date_price_idx",
+            ),
+            models.Index(
+                fields=["added_by", "-date_added", "-total_price", "unique_id"],
+                include=["modified"],
+                name="expense_added_by_date_idx",
+            ),
+            models.Index(fields=["modified"], name="expense_modified_idx"),
+            models.Index(fields=["txid", "id"], name="expense_txid_idx"),
+        ]
 
     def save(self, *args, **kwargs):
+        # The same value the trigger writes, needed here to update the rollups
         self.total_price = int(self.item_price) * int(self.item_quantity)
+        self.date_added = self._meta.get_field("date_added").to_python(self.date_added)
+        previous = None
+        if not self._state.adding:
+            previous = Expenses.objects.filter(pk=self.pk).values("date_added", "total_price").first()
+
         super().save(*args, **kwargs)
+
+        if previous:
+            MonthlyBudgetRollup.objects.add_to_month(
+                previous["date_added"], total_expenses=-previous["total_price"], expense_count=-1
+            )
+        MonthlyBudgetRollup.objects.add_to_month(self.date_added, total_expenses=self.total_price, expense_count=1)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        MonthlyBudgetRollup.objects.add_to_month(self.date_added, total_expenses=-self.total_price, expense_count=-1)
+        Tombstone.objects.record("expenses", [self.unique_id])
+        return result
+
+
+class MonthlyBudgetRollup(TimeStampedModel):
+    """
+    Expenses and contribution totals of one month, kept up to date on every write.
+    """
+
+    month = models.DateField(unique=True)
+    total_expenses = models.BigIntegerField(default=0)
+    total_contribution = models.BigIntegerField(default=0)
+    # Rows summed on either side, a month without any has no total rather than a total of 0
+    expense_count = models.IntegerField(default=0)
+    contribution_count = models.IntegerField(default=0)
+
+    objects: MonthlyBudgetRollupManager = MonthlyBudgetRollupManager()
+
+
+class Tombstone(TimeStampedModel):
+    """
+    Record of a deleted expense, contribution or contributor, read by the change feed.
+
+    ``key`` is the unique_id of expenses and contributions and the name of contributors.
+    """
+
+    resource = models.CharField(max_length=25)
+    key = models.CharField(max_length=255)
+    txid = models.BigIntegerField(editable=False)
+
+    objects: TombstoneManager = TombstoneManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["txid", "id"], name="tombstone_txid_idx"),
+        ]
+
+
+class ContributorPurge(TimeStampedModel):
+    """
+    Background removal of the contributions of a deleted contributor, then of the contributor itself.
+    """
+
+    contributor = models.ForeignKey(Contributors, on_delete=models.SET_NULL, null=True)
+    name = models.CharField(max_length=255, null=True)
+    total_contributions = models.PositiveIntegerField(default=0)
+    purged_contributions = models.PositiveIntegerField(default=0)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    objects: ContributorPurgeManager = ContributorPurgeManager()
+
+    @property
+    def status(self):
+        if self.finished:
+            return "done"
+        return "running" if self.purged_contributions else "pending"
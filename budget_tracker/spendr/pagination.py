@@ -0,0 +1,137 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+EXPENSES_ORDERING = ("-date_added", "-total_price", "unique_id")
+CONTRIBUTIONS_ORDERING = ("-contribution_date", "unique_id")
+
+
+def is_pagination_requested(query_params):
+    return "page_size" in query_params or "cursor" in query_params
+
+
+def is_invalid_page_size(page_size):
+    if page_size is None or (page_size.isdigit() and int(page_size) > 0):
+        return False
+
+    return Response({"message": "Provide a valid page_size value"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def get_page_size(page_size):
+    if page_size is None:
+        return DEFAULT_PAGE_SIZE
+    return min(int(page_size), MAX_PAGE_SIZE)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, ordering):
+    """
+    Return the ordering values stored in a cursor, or None if the cursor cannot be used with the ordering.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+
+    return values
+
+
+def get_keyset_query(ordering, values, nullable=()):
+    """
+    Build the filter selecting the rows that come after ``values`` in ``ordering``.
+
+    For an ordering ``(-a, b)`` this is ``a <= va AND (a < va OR (a = va AND b > vb))``. The redundant bound on
+    the first field is what the planner turns into an index condition, the OR alone is only a filter and the
+    index scan would go through every row before the cursor.
+
+    The fields of ``nullable`` may hold NULLs, which Postgres sorts first in descending order and last in
+    ascending order, and a None value stands for a NULL.
+    """
+    query = Q()
+    equal_query = Q()
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        query = query | (equal_query & get_after_query(field, value, name in nullable))
+        equal_query = equal_query & Q(**{f"{name}__isnull": True} if value is None else {name: value})
+
+    first_field, first_value = ordering[0], values[0]
+    name = first_field.lstrip("-")
+    if first_value is None:
+        # The NULLs come first in descending order, nothing bounds the rows left after them
+        bound_query = Q() if first_field.startswith("-") else Q(**{f"{name}__isnull": True})
+    elif first_field.startswith("-"):
+        bound_query = Q(**{f"{name}__lte": first_value})
+    else:
+        bound_query = Q(**{f"{name}__gte": first_value})
+        if name in nullable:
+            bound_query = bound_query | Q(**{f"{name}__isnull": True})
+    return bound_query & query
+
+
+def get_after_query(field, value, nullable):
+    """
+    Build the filter selecting the values of ``field`` strictly after ``value`` in its order.
+    """
+    name = field.lstrip("-")
+    descending = field.startswith("-")
+    if value is None:
+        # Every value follows the NULLs in descending order, none in ascending order
+        return Q(**{f"{name}__isnull": False}) if descending else Q(pk__in=[])
+
+    query = Q(**{f"{name}__lt" if descending else f"{name}__gt": value})
+    if nullable and not descending:
+        query = query | Q(**{f"{name}__isnull": True})
+    return query
+
+
+def paginate_queryset(queryset, ordering, fields, cursor, page_size):
+    """
+    Return one page of ``queryset`` as dictionaries of ``fields`` and the cursor of the next page.
+
+    The rows are read with a keyset (seek) condition on ``ordering`` instead of an OFFSET, so with an index on
+    ``ordering`` every page costs the same no matter how deep the client has paged. The last field of
+    ``ordering`` must be unique, the others may hold NULLs.
+    Raises ``ValidationError`` when the cursor cannot be decoded.
+    """
+    ordering_fields = [field.lstrip("-") for field in ordering]
+    nullable = {field for field in ordering_fields if queryset.model._meta.get_field(field).null}
+    extra_fields = [field for field in ordering_fields if field not in fields]
+
+    try:
+        if cursor:
+            values = decode_cursor(cursor, ordering)
+            if values is None:
+                raise ValidationError("Invalid cursor")
+            queryset = queryset.filter(get_keyset_query(ordering, values, nullable))
+
+        rows = list(queryset.order_by(*ordering).values(*fields, *extra_fields)[: page_size + 1])
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid cursor")
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(
+            [None if rows[-1][field] is None else str(rows[-1][field]) for field in ordering_fields]
+        )
+
+    if extra_fields:
+        for row in rows:
+            for field in extra_fields:
+                del row[field]
+
+    return rows, next_cursor
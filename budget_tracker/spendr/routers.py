@@ -0,0 +1,57 @@
+"""
+Read replica routing of the spendr GET endpoints.
+
+Reads go to the primary database unless a view opted in with ``ReplicaReadsMixin``, in which case they
+are spread over the ``SPENDR_REPLICA_DATABASES``. A user who just wrote is pinned to the primary for
+``PRIMARY_PIN_SECONDS``, long enough for the replicas to catch up, so that they read their own writes.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY_PIN_SECONDS = 5
+
+# Set for the duration of a request allowed to read from the replicas
+replica_reads = ContextVar("replica_reads", default=False)
+# Set for the duration of a request that would read from the replicas but for a recent write of the user
+primary_pinned = ContextVar("primary_pinned", default=False)
+
+
+def get_pin_key(user):
+    return f"spendr:primary:{user.pk}"
+
+
+def pin_to_primary(user):
+    if settings.SPENDR_REPLICA_DATABASES and user is not None and user.is_authenticated:
+        cache.set(get_pin_key(user), True, PRIMARY_PIN_SECONDS)
+
+
+def can_read_from_replicas(user):
+    if not settings.SPENDR_REPLICA_DATABASES:
+        return False
+    return not (user is not None and user.is_authenticated and cache.get(get_pin_key(user), False))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.SPENDR_REPLICA_DATABASES
+        # Transactions read their own writes on the primary
+        if not (replicas and replica_reads.get()) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Not None, which would save the instances read from a replica back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.SPENDR_REPLICA_DATABASES:
+            return False
+        return None
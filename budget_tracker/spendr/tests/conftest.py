@@ -0,0 +1,41 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.managers import get_deleted_contributor_ids
+from budget_tracker.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # The database is rolled back after every test but the cache is not
+    cache.clear()
+
+
+@pytest.fixture
+def cached_deleted_contributors(db):
+    # Read once a minute across requests, the query counts leave it out
+    get_deleted_contributor_ids()
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def capture_queries():
+    """
+    Capture the queries of a block, ignoring the savepoints opened by ATOMIC_REQUESTS.
+    """
+
+    class QueryCounter(CaptureQueriesContext):
+        @property
+        def statements(self):
+            return [query["sql"] for query in self.captured_queries if "SAVEPOINT" not in query["sql"]]
+
+    return lambda: QueryCounter(connection)
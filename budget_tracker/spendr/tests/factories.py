@@ -0,0 +1,40 @@
+import datetime
+
+from factory import Faker, SubFactory
+from factory.django import DjangoModelFactory
+
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses
+
+
+class ContributorFactory(DjangoModelFactory):
+    name = Faker("first_name")
+
+    class Meta:
+        model = Contributors
+
+
+class ContributionFactory(DjangoModelFactory):
+    contributor = SubFactory(ContributorFactory)
+    contribution_date = datetime.date(2023, 1, 1)
+    contribution_amount = Faker("pyint", min_value=1, max_value=10_000)
+
+    class Meta:
+        model = Contributions
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        # Contributions.save() pins the date to the current year, insert the row as given instead.
+        contribution = model_class(*args, **kwargs)
+        contribution.denormalize()
+        return model_class.objects.bulk_create([contribution])[0]
+
+
+class ExpenseFactory(DjangoModelFactory):
+    added_by = Faker("first_name")
+    date_added = datetime.date(2023, 1, 1)
+    item_name = Faker("word")
+    item_price = Faker("pyint", min_value=1, max_value=1_000)
+    item_quantity = 1
+
+    class Meta:
+        model = Expenses
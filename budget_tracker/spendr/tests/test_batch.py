@@ -0,0 +1,97 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, MonthlyBudgetRollup, Tombstone
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestApplyBatch:
+    url = reverse("batch_endpoint")
+
+    def test_mixed_operations(self, api_client: APIClient, capture_queries):
+        expense = ExpenseFactory(date_added=datetime.date(2023, 1, 5))
+        contribution = ContributionFactory(contributor=ContributorFactory(name="ali"))
+        operations = [
+            {"op": "create_contributor", "contributor": "Sara"},
+            {"op": "create_contribution", "contributor": "sara", "month": "1", "contribution": "300"},
+            {"op": "create_expense", "item_name": "Milk", "item_price": 10, "item_quantity": 3, "date": "2023-01-10"},
+            {"op": "delete_expense", "unique_id": str(expense.unique_id)},
+            {"op": "delete_contribution", "unique_id": str(contribution.unique_id)},
+        ]
+
+        with capture_queries() as queries:
+            response = api_client.post(self.url, operations, format="json")
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [201, 201, 201, 200, 200]
+        assert results[2]["unique_id"] == str(Expenses.objects.get().unique_id)
+        # 3 lookups, 3 inserts, 2 deletes, 2 tombstone inserts and the rollup refresh
+        assert len(queries.statements) == 13
+
+        assert list(Expenses.objects.values_list("item_name", "total_price")) == [("milk", 30)]
+        assert list(Contributions.objects.values_list("contributor__name", "contribution_amount")) == [("sara", 300)]
+        assert set(Contributors.objects.values_list("name", flat=True)) == {"ali", "sara"}
+        assert Tombstone.objects.count() == 2
+        rollup = MonthlyBudgetRollup.objects.get(month=datetime.date(2023, 1, 1))
+        assert rollup.total_expenses == 30
+
+    def test_operations_apply_in_order(self, api_client: APIClient):
+        expense = ExpenseFactory()
+        operations = [
+            {"op": "create_contribution", "contributor": "sara", "month": "1", "contribution": "300"},
+            {"op": "create_contributor", "contributor": "sara"},
+            {"op": "delete_expense", "unique_id": str(expense.unique_id)},
+            {"op": "delete_expense", "unique_id": str(expense.unique_id)},
+        ]
+
+        response = api_client.post(f"{self.url}?allow_partial=true", operations, format="json")
+
+        assert response.status_code == 200
+        assert [(result["status"], result["message"]) for result in response.json()["results"]] == [
+            (400, "Contributor sara does not exist"),
+            (201, "Contributor sara has been created"),
+            (200, f"Expense {expense.unique_id} has been deleted"),
+            (400, f"Expense {expense.unique_id} does not exist"),
+        ]
+        assert not Expenses.objects.exists()
+        assert not Contributions.objects.exists()
+
+    def test_failing_operation_rejects_batch(self, api_client: APIClient):
+        operations = [
+            {"op": "create_expense", "item_name": "milk", "item_price": 10},
+            {"op": "delete_contribution", "unique_id": "not-a-uuid"},
+        ]
+
+        response = api_client.post(self.url, operations, format="json")
+
+        assert response.status_code == 400
+        assert response.json()["errors"] == [
+            {"index": 1, "op": "delete_contribution", "status": 400, "message": "Invalid unique_id: not-a-uuid"}
+        ]
+        assert not Expenses.objects.exists()
+
+    def test_expense_dates(self, api_client: APIClient):
+        operations = [
+            {"op": "create_expense", "item_name": "milk", "item_price": 10, "date": "2023-1-5"},
+            {"op": "create_expense", "item_name": "bread", "item_price": 10, "date": "2023-02-30"},
+        ]
+
+        response = api_client.post(f"{self.url}?allow_partial=true", operations, format="json")
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [(result["status"], result["message"]) for result in results] == [
+            (201, "Expense has been saved for milk"),
+            (400, "Provide a valid date format: YYYY-MM-DD"),
+        ]
+        assert Expenses.objects.get().date_added == datetime.date(2023, 1, 5)
+
+    @pytest.mark.parametrize("operations", [[], {"op": "create_expense"}, [{"op": "update_expense"}], ["milk"]])
+    def test_invalid_body(self, api_client: APIClient, operations):
+        assert api_client.post(self.url, operations, format="json").status_code == 400
@@ -0,0 +1,187 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, Expenses, MonthlyBudgetRollup
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def get_rollup(year, month, *fields):
+    return MonthlyBudgetRollup.objects.filter(month=datetime.date(year, month, 1)).values(
+        *(fields or ("total_expenses", "total_contribution"))
+    )[0]
+
+
+class TestMonthlyBudgetRollup:
+    def test_expense_save_and_delete(self):
+        expense = Expenses(added_by="ali", item_name="milk", item_price=10, item_quantity=3, date_added="2023-01-05")
+        expense.save()
+        Expenses(added_by="ali", item_name="bread", item_price=5, date_added=datetime.date(2023, 1, 20)).save()
+
+        assert get_rollup(2023, 1) == {"total_expenses": 35, "total_contribution": 0}
+
+        expense.item_quantity = 1
+        expense.date_added = datetime.date(2023, 2, 1)
+        expense.save()
+
+        assert get_rollup(2023, 1)["total_expenses"] == 5
+        assert get_rollup(2023, 2)["total_expenses"] == 10
+
+        Expenses.objects.get(pk=expense.pk).delete()
+
+        assert get_rollup(2023, 2)["total_expenses"] == 0
+
+    def test_contribution_save_and_delete(self):
+        contribution = Contributions(contributor=ContributorFactory(), contribution_amount="500")
+        contribution.save(month=1)
+        year = datetime.date.today().year
+
+        assert get_rollup(year, 1)["total_contribution"] == 500
+
+        Contributions.objects.get(pk=contribution.pk).delete()
+
+        assert get_rollup(year, 1)["total_contribution"] == 0
+
+    def test_contributor_delete_refreshes_cascaded_months(self):
+        contributor = ContributorFactory()
+        Contributions(contributor=contributor, contribution_amount=100).save(month=1)
+        Contributions(contributor=ContributorFactory(), contribution_amount=50).save(month=1)
+
+        contributor.delete()
+
+        assert get_rollup(datetime.date.today().year, 1)["total_contribution"] == 50
+
+    def test_row_counts(self):
+        expense = ExpenseFactory.build(item_price=10, date_added=datetime.date(2023, 1, 5))
+        expense.save()
+        ExpenseFactory.build(item_price=5, date_added=datetime.date(2023, 1, 20)).save()
+        contribution = Contributions(contributor=ContributorFactory(), contribution_amount=500)
+        contribution.save(month=1)
+        year = datetime.date.today().year
+
+        assert get_rollup(2023, 1, "expense_count", "contribution_count") == {
+            "expense_count": 2,
+            "contribution_count": 0,
+        }
+        assert get_rollup(year, 1, "contribution_count")["contribution_count"] == 1
+
+        expense.date_added = datetime.date(2023, 2, 1)
+        expense.save()
+        contribution.delete()
+
+        assert get_rollup(2023, 1, "expense_count")["expense_count"] == 1
+        assert get_rollup(2023, 2, "expense_count")["expense_count"] == 1
+        assert get_rollup(year, 1, "contribution_count")["contribution_count"] == 0
+
+    def test_rebuild_command(self):
+        # factories insert rows in bulk, so the rollups only appear after a rebuild
+        ExpenseFactory(item_price=20, date_added=datetime.date(2023, 3, 4))
+        ContributionFactory(contribution_amount=70, contribution_date=datetime.date(2023, 3, 1))
+        MonthlyBudgetRollup.objects.create(month=datetime.date(2023, 4, 1), total_expenses=1)
+
+        call_command("rebuild_budget_rollups")
+
+        assert list(
+            MonthlyBudgetRollup.objects.values_list(
+                "month", "total_expenses", "total_contribution", "expense_count", "contribution_count"
+            )
+        ) == [(datetime.date(2023, 3, 1), 20, 70, 1, 1)]
+
+
+class TestBudgetStatus:
+    url = reverse("status_endpoint")
+
+    def test_status(self, api_client: APIClient, capture_queries):
+        MonthlyBudgetRollup.objects.create(
+            month=datetime.date(2023, 5, 1),
+            total_expenses=30,
+            total_contribution=100,
+            expense_count=2,
+            contribution_count=1,
+        )
+
+        with capture_queries() as queries:
+            response = api_client.get(self.url, {"year_month": "2023-05"})
+
+        assert len(queries.statements) == 1
+        assert response.json()["response"] == {
+            "year_month": "2023-05",
+            "total_expenses": 30,
+            "total_contribution": 100,
+            "remaining_budget": 70,
+        }
+
+    def test_status_without_data(self, api_client: APIClient):
+        response = api_client.get(self.url, {"year_month": "2023-05"})
+
+        assert response.json()["response"]["total_expenses"] is None
+        assert response.json()["response"]["remaining_budget"] is None
+
+    def test_status_follows_writes(self, api_client: APIClient, user):
+        user.name = "ali"
+        user.save()
+        api_client.post(f"{reverse('expenses_endpoint')}?item_name=milk&item_price=25&date=2023-05-02")
+
+        response = api_client.get(self.url, {"year_month": "2023-05"})
+
+        assert response.json()["response"]["total_expenses"] == 25
+
+    def test_status_with_one_side_only(self, api_client: APIClient, user):
+        user.name = "ali"
+        user.save()
+        expenses_url = reverse("expenses_endpoint")
+        api_client.post(f"{expenses_url}?item_name=milk&item_price=25&date=2023-05-02")
+
+        response = api_client.get(self.url, {"year_month": "2023-05"})
+
+        # like the months without any row, not a total of 0
+        assert response.json()["response"] == {
+            "year_month": "2023-05",
+            "total_expenses": 25,
+            "total_contribution": None,
+            "remaining_budget": None,
+        }
+
+    def test_range(self, api_client: APIClient, capture_queries):
+        MonthlyBudgetRollup.objects.create(
+            month=datetime.date(2022, 12, 1),
+            total_expenses=30,
+            total_contribution=100,
+            expense_count=2,
+            contribution_count=1,
+        )
+        MonthlyBudgetRollup.objects.create(
+            month=datetime.date(2023, 2, 1),
+            total_expenses=10,
+            total_contribution=40,
+            expense_count=1,
+            contribution_count=1,
+        )
+        MonthlyBudgetRollup.objects.create(month=datetime.date(2023, 3, 1), total_expenses=15, expense_count=1)
+
+        with capture_queries() as queries:
+            response = api_client.get(self.url, {"start_year_month": "2022-12", "end_year_month": "2023-03"})
+
+        assert len(queries.statements) == 1
+        assert response.json()["response"]["budget_status"] == [
+            {"year_month": "2022-12", "total_expenses": 30, "total_contribution": 100, "remaining_budget": 70},
+            {"year_month": "2023-01", "total_expenses": None, "total_contribution": None, "remaining_budget": None},
+            {"year_month": "2023-02", "total_expenses": 10, "total_contribution": 40, "remaining_budget": 30},
+            {"year_month": "2023-03", "total_expenses": 15, "total_contribution": None, "remaining_budget": None},
+        ]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"start_year_month": "2023-03", "end_year_month": "2023-02"},
+            {"start_year_month": "2000-01", "end_year_month": "2023-02"},
+            {"start_year_month": "2023-13", "end_year_month": "2023-02"},
+        ],
+    )
+    def test_invalid_range(self, api_client: APIClient, params):
+        assert api_client.get(self.url, params).status_code == 400
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Expenses, MonthlyBudgetRollup
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBulkCreateExpenses:
+    url = reverse("bulk_expenses_endpoint")
+
+    def test_json_body(self, api_client: APIClient, capture_queries, cached_deleted_contributors):
+        rows = [
+            {"item_name": "Milk", "item_price": 10, "item_quantity": 3, "date": "2023-01-05"},
+            {"item_name": "bread", "item_price": "5", "date": "2023-02-01"},
+        ]
+
+        with capture_queries() as queries:
+            response = api_client.post(self.url, rows, format="json")
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        # one insert plus the rollup refresh, whatever the number of rows
+        assert len(queries.statements) == 4
+        assert sorted(Expenses.objects.values_list("item_name", "total_price")) == [("bread", 5), ("milk", 30)]
+        assert MonthlyBudgetRollup.objects.get(month=datetime.date(2023, 1, 1)).total_expenses == 30
+
+    def test_csv_body(self, api_client: APIClient):
+        body = "item_name,item_price,item_quantity,date\nmilk,10,2,2023-01-05\nbread,4,,\n"
+
+        response = api_client.post(self.url, body, content_type="text/csv")
+
+        assert response.status_code == 200
+        assert Expenses.objects.get(item_name="bread").date_added == datetime.date.today()
+        assert Expenses.objects.get(item_name="milk").total_price == 20
+
+    def test_invalid_row_rejects_batch(self, api_client: APIClient):
+        rows = [{"item_name": "milk", "item_price": 10}, {"item_name": "bread", "item_price": -1}]
+
+        response = api_client.post(self.url, rows, format="json")
+
+        assert response.status_code == 400
+        assert response.json()["errors"] == [{"row": 1, "message": "Provide a valid item price value"}]
+        assert not Expenses.objects.exists()
+
+    def test_allow_partial(self, api_client: APIClient):
+        rows = [{"item_name": "milk", "item_price": 10}, {"item_name": "bread", "item_price": 1, "date": "2023-02-30"}]
+
+        response = api_client.post(f"{self.url}?allow_partial=true", rows, format="json")
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+        assert response.json()["errors"] == [{"row": 1, "message": "Provide a valid date format: YYYY-MM-DD"}]
+        assert list(Expenses.objects.values_list("item_name", flat=True)) == ["milk"]
+
+    def test_dates_without_leading_zeros(self, api_client: APIClient):
+        rows = [{"item_name": "milk", "item_price": 10, "date": "2023-1-5"}]
+
+        response = api_client.post(self.url, rows, format="json")
+
+        assert response.status_code == 200
+        assert Expenses.objects.get().date_added == datetime.date(2023, 1, 5)
+
+    @pytest.mark.parametrize("rows", [[], {"item_name": "milk"}, ["milk"]])
+    def test_invalid_body(self, api_client: APIClient, rows):
+        assert api_client.post(self.url, rows, format="json").status_code == 400
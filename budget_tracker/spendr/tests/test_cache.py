@@ -0,0 +1,87 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.cache import get_cache_stats
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestResponseCache:
+    expenses_url = reverse("expenses_endpoint")
+    status_url = reverse("status_endpoint")
+
+    def test_hit_skips_the_database(self, api_client: APIClient, capture_queries):
+        ExpenseFactory.create_batch(3)
+        first = api_client.get(self.expenses_url, {"item_name": "milk", "added_by": "ali"})
+
+        with capture_queries() as queries:
+            # the order of the query parameters does not matter
+            second = api_client.get(self.expenses_url, {"added_by": "ali", "item_name": "milk"})
+
+        assert queries.statements == []
+        assert second.json() == first.json()
+        assert get_cache_stats() == {"hits": 1, "misses": 1}
+
+    def test_write_invalidates_only_its_month(
+        self, api_client: APIClient, user, capture_queries, django_capture_on_commit_callbacks
+    ):
+        user.name = "ali"
+        user.save()
+        api_client.get(self.status_url, {"year_month": "2023-01"})
+        api_client.get(self.status_url, {"year_month": "2023-02"})
+        api_client.get(self.expenses_url, {"start_date": "2023-02-01", "end_date": "2023-02-28"})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(f"{self.expenses_url}?item_name=milk&item_price=25&date=2023-01-10")
+
+        with capture_queries() as queries:
+            february = api_client.get(self.status_url, {"year_month": "2023-02"})
+            api_client.get(self.expenses_url, {"start_date": "2023-02-01", "end_date": "2023-02-28"})
+        assert queries.statements == []
+        assert february.json()["response"]["total_expenses"] is None
+
+        january = api_client.get(self.status_url, {"year_month": "2023-01"})
+        assert january.json()["response"]["total_expenses"] == 25
+
+    def test_unbounded_query_follows_every_write(self, api_client: APIClient, django_capture_on_commit_callbacks):
+        expense = ExpenseFactory(date_added=datetime.date(2023, 1, 1))
+        assert len(api_client.get(self.expenses_url).json()["response"]["expenses"]) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"{self.expenses_url}?unique_id={expense.unique_id}")
+
+        assert api_client.get(self.expenses_url).json()["response"]["expenses"] == []
+
+    def test_contributor_delete_invalidates_contributions(
+        self, api_client: APIClient, django_capture_on_commit_callbacks
+    ):
+        contributor = ContributorFactory(name="ali")
+        ContributionFactory(contributor=contributor, contribution_date=datetime.date(2023, 1, 1))
+        url = reverse("contributions_endpoint")
+        params = {"start_year_month": "2023-01", "end_year_month": "2023-01"}
+        assert api_client.get(url, params).json()["response"]["total_contributions"] is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"{reverse('contributors_endpoint')}?contributor=ali")
+
+        assert api_client.get(url, params).json()["response"]["total_contributions"] is None
+
+    def test_contributor_rename_invalidates_contributions(
+        self, api_client: APIClient, django_capture_on_commit_callbacks
+    ):
+        contributor = ContributorFactory(name="ali")
+        ContributionFactory(contributor=contributor, contribution_date=datetime.date(2023, 1, 1))
+        url = reverse("contributions_endpoint")
+        params = {"start_year_month": "2023-01", "end_year_month": "2023-01"}
+        api_client.get(url, params)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            contributor.name = "ali raza"
+            contributor.save()
+
+        [contribution] = api_client.get(url, params).json()["response"]["contributions"]
+        assert contribution["contributor_name"] == "Ali Raza"
@@ -0,0 +1,123 @@
+import datetime
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, Expenses, Tombstone
+from budget_tracker.spendr.pagination import encode_cursor
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory, ExpenseFactory
+from budget_tracker.spendr.views import changes
+
+# Outside of the test transaction, whose writes the feed would hold back until it ends
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestListChanges:
+    url = reverse("changes_endpoint")
+
+    def test_full_sync_then_incremental(self, api_client: APIClient):
+        expense = ExpenseFactory()
+        contribution = ContributionFactory(contributor__name="ali")
+
+        first = api_client.get(self.url).json()
+        assert [row["unique_id"] for row in first["changes"]["expenses"]] == [str(expense.unique_id)]
+        assert [row["unique_id"] for row in first["changes"]["contributions"]] == [str(contribution.unique_id)]
+        assert [row["name"] for row in first["changes"]["contributors"]] == ["Ali"]
+        assert first["has_more"] is False
+
+        new_expense = ExpenseFactory()
+        Expenses.objects.get(pk=expense.pk).delete()
+
+        second = api_client.get(self.url, {"since": first["next_cursor"]}).json()
+        assert [row["unique_id"] for row in second["changes"]["expenses"]] == [str(new_expense.unique_id)]
+        assert second["changes"]["contributions"] == []
+        assert [(row["resource"], row["key"]) for row in second["changes"]["deleted"]] == [
+            ("expenses", str(expense.unique_id))
+        ]
+
+        third = api_client.get(self.url, {"since": second["next_cursor"]}).json()
+        assert all(rows == [] for rows in third["changes"].values())
+
+    def test_contributor_delete_records_cascaded_contributions(self, api_client: APIClient):
+        contributor = ContributorFactory(name="ali")
+        contributions = ContributionFactory.create_batch(2, contributor=contributor)
+
+        contributor.delete()
+
+        assert not Contributions.objects.exists()
+        assert set(Tombstone.objects.values_list("resource", "key")) == {
+            ("contributors", "ali"),
+            *(("contributions", str(contribution.unique_id)) for contribution in contributions),
+        }
+
+    def test_limit_pages_through_rows_sharing_a_timestamp(self, api_client: APIClient):
+        # rows written by one bulk statement can share the same modified timestamp
+        expenses = ExpenseFactory.create_batch(5)
+        Expenses.objects.update(modified=datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc))
+
+        seen: list[str] = []
+        cursor, has_more = None, True
+        while has_more:
+            data = api_client.get(self.url, {"limit": 2} | ({"since": cursor} if cursor else {})).json()
+            seen.extend(row["unique_id"] for row in data["changes"]["expenses"])
+            cursor, has_more = data["next_cursor"], data["has_more"]
+
+        assert sorted(seen) == sorted(str(expense.unique_id) for expense in expenses)
+
+    def test_holds_back_running_transactions(self, api_client: APIClient):
+        first = ExpenseFactory()
+        barrier_in, barrier_out = threading.Barrier(2, timeout=5), threading.Barrier(2, timeout=5)
+
+        def write_slowly():
+            # started before the feed is read, committed after it
+            with transaction.atomic():
+                # a month of its own, the rollup row it updates stays locked until the commit
+                ExpenseFactory(item_name="slow", date_added=datetime.date(2023, 2, 1))
+                barrier_in.wait()
+                barrier_out.wait()
+            connection.close()
+
+        thread = threading.Thread(target=write_slowly)
+        thread.start()
+        barrier_in.wait()
+        try:
+            later = ExpenseFactory(date_added=datetime.date(2023, 3, 1))
+            data = api_client.get(self.url).json()
+        finally:
+            barrier_out.wait()
+            thread.join()
+
+        assert [row["unique_id"] for row in data["changes"]["expenses"]] == [str(first.unique_id)]
+
+        data = api_client.get(self.url, {"since": data["next_cursor"]}).json()
+        assert {row["item_name"] for row in data["changes"]["expenses"]} == {"slow", later.item_name}
+
+    def test_page_starts_at_the_cursor(self, capture_queries):
+        ExpenseFactory.create_batch(3)
+
+        with capture_queries() as queries:
+            changes.read_stream(Expenses.objects.all(), ("unique_id",), [0, 1], changes.get_horizon(), 10)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # the table is tiny, stop the planner from preferring a scan followed by a sort
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            cursor.execute(f"EXPLAIN {queries.statements[-1]}")
+            plan = "\n".join(line for line, in cursor.fetchall())
+
+        assert "expense_txid_idx" in plan
+        assert "Index Cond: ((ROW(txid, id) > ROW(0, 1))" in plan
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"since": "garbage"},
+            {"since": encode_cursor([["abc", 1], None, None, None])},
+            {"since": encode_cursor([1, 2, 3, 4])},
+            {"limit": "0"},
+        ],
+    )
+    def test_invalid_parameters(self, api_client: APIClient, params):
+        assert api_client.get(self.url, params).status_code == 400
@@ -0,0 +1,118 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.conditional import get_validator_headers
+from budget_tracker.spendr.managers import get_deleted_contributor_ids
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, MonthlyBudgetRollup
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize(
+        "url_name, factory",
+        [
+            ("expenses_endpoint", ExpenseFactory),
+            ("contributions_endpoint", ContributionFactory),
+            ("contributors_endpoint", ContributorFactory),
+        ],
+    )
+    def test_not_modified(self, api_client: APIClient, url_name, factory, capture_queries):
+        factory.create_batch(3)
+        url = reverse(url_name)
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert response.status_code == 200
+        assert response["Last-Modified"]
+
+        # once from the response cache, without any query
+        with capture_queries() as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert queries.statements == []
+
+        # and once from the validator query alone
+        cache.clear()
+        get_deleted_contributor_ids()
+        with capture_queries() as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert len(queries.statements) == 1
+
+    def test_etag_changes_with_the_data(self, api_client: APIClient):
+        url = reverse("expenses_endpoint")
+        expenses = ExpenseFactory.create_batch(2)
+        etag = api_client.get(url)["ETag"]
+
+        expenses[0].delete()
+        cache.clear()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_budget_status(self, api_client: APIClient):
+        MonthlyBudgetRollup.objects.create(month=datetime.date(2023, 1, 1), total_expenses=5)
+        url = reverse("status_endpoint")
+        etag = api_client.get(url, {"year_month": "2023-01"})["ETag"]
+        cache.clear()
+
+        assert api_client.get(url, {"year_month": "2023-01"}, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        MonthlyBudgetRollup.objects.add_to_month(datetime.date(2023, 1, 1), total_expenses=5)
+        cache.clear()
+
+        assert api_client.get(url, {"year_month": "2023-01"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+class TestValidatorPlans:
+    def explain_validator(self, queryset, capture_queries):
+        with capture_queries() as queries:
+            get_validator_headers(queryset)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # the tables are tiny, stop the planner from preferring to read the heap
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            cursor.execute(f"EXPLAIN {queries.statements[-1]}")
+            return "\n".join(line for line, in cursor.fetchall())
+
+    @pytest.mark.parametrize(
+        "filters, index_name",
+        [
+            # any covering index, the narrow expense_modified_idx once the table is analyzed
+            ({}, ""),
+            ({"date_added__gte": datetime.date(2023, 1, 1)}, "expense_date_price_idx"),
+            ({"item_name": "milk"}, "expense_item_date_price_idx"),
+            ({"added_by": "ali"}, "expense_added_by_date_idx"),
+        ],
+    )
+    def test_expenses(self, capture_queries, filters, index_name):
+        plan = self.explain_validator(Expenses.objects.filter(**filters), capture_queries)
+
+        assert f"Index Only Scan using {index_name}" in plan
+        assert "Seq Scan" not in plan
+
+    @pytest.mark.parametrize(
+        "filters, index_name",
+        [
+            ({}, ""),
+            ({"contribution_date__gte": datetime.date(2023, 1, 1)}, "contribution_listing_idx"),
+        ],
+    )
+    def test_contributions(self, capture_queries, filters, index_name):
+        ContributorFactory(name="ali").soft_delete()
+
+        plan = self.explain_validator(Contributions.objects.filter(**filters), capture_queries)
+
+        assert f"Index Only Scan using {index_name}" in plan
+
+    def test_contributors(self, capture_queries):
+        plan = self.explain_validator(Contributors.objects.all(), capture_queries)
+
+        assert "Index Only Scan using contributor_modified_idx" in plan
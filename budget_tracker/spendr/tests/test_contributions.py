@@ -0,0 +1,131 @@
+import datetime
+import re
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory
+from budget_tracker.spendr.utils import aggregate_contributions, get_contribution_initial_query
+
+pytestmark = pytest.mark.django_db
+
+
+class TestAggregateContributions:
+    def test_amounts_and_percentages(self):
+        ali = ContributorFactory(name="ali")
+        sara = ContributorFactory(name="sara")
+        ContributionFactory(contributor=ali, contribution_amount=100)
+        ContributionFactory(contributor=ali, contribution_amount=200)
+        ContributionFactory(contributor=sara, contribution_amount=100)
+
+        total_contribution, contribution_per_contributor = aggregate_contributions(Contributions.objects.all())
+
+        assert total_contribution == 400
+        assert contribution_per_contributor == {
+            "Ali": {"amount": 300, "percentage": 75.0},
+            "Sara": {"amount": 100, "percentage": 25.0},
+        }
+
+    def test_empty_queryset(self):
+        assert aggregate_contributions(Contributions.objects.all()) == (None, {})
+
+
+class TestContributionInitialQuery:
+    def test_range_across_year_boundary(self):
+        ContributionFactory(contribution_date=datetime.date(2022, 10, 1))
+        november = ContributionFactory(contribution_date=datetime.date(2022, 11, 1))
+        february = ContributionFactory(contribution_date=datetime.date(2023, 2, 1))
+        ContributionFactory(contribution_date=datetime.date(2023, 3, 1))
+
+        queryset = get_contribution_initial_query(None, "2022-11", "2023-02")
+
+        assert set(queryset) == {november, february}
+
+    def test_range_end_of_year(self):
+        december = ContributionFactory(contribution_date=datetime.date(2022, 12, 1))
+        ContributionFactory(contribution_date=datetime.date(2023, 1, 1))
+
+        assert list(get_contribution_initial_query(None, "2022-12", "2022-12")) == [december]
+
+    def test_range_uses_date_index(self):
+        ContributionFactory.create_batch(5)
+        queryset = get_contribution_initial_query(None, "2022-11", "2023-02")
+
+        with connection.cursor() as cursor:
+            # the tables are tiny, stop the planner from preferring a sequential scan
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        # contribution_date_contrib_idx or contribution_listing_idx, both lead with the date
+        assert re.search(r"(Index|Recheck) Cond: \(\(contribution_date >= '2022-11-01'::date\)", plan)
+        assert "EXTRACT" not in plan.upper()
+
+
+class TestListContributions:
+    url = reverse("contributions_endpoint")
+
+    def test_list(self, api_client: APIClient):
+        contribution = ContributionFactory(contributor__name="ali", contribution_amount=150)
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        data = response.json()["response"]
+        assert data["contributions"] == [
+            {
+                "year_month": "2023-01",
+                "contributor_name": "Ali",
+                "contribution_amount": 150,
+                "unique_id": str(contribution.unique_id),
+            }
+        ]
+        assert data["total_contributions"] == 150
+        assert data["contribution_per_contributor"] == {"Ali": {"amount": 150, "percentage": 100.0}}
+
+    # Outside of the test transaction, in which the ids of the deleted contributors are not cached
+    @pytest.mark.django_db(transaction=True)
+    def test_listing_reads_the_stored_fields(self, api_client: APIClient, capture_queries):
+        ContributionFactory.create_batch(3)
+        ContributorFactory(name="sara").soft_delete()
+        api_client.get(self.url)
+
+        with capture_queries() as queries:
+            response = api_client.get(self.url, {"page_size": 2})
+
+        assert len(response.json()["response"]["contributions"]) == 2
+        # neither the contributors table nor per row function calls
+        assert not [
+            sql for sql in queries.statements if "spendr_contributors" in sql or "INITCAP" in sql or "LPAD" in sql
+        ]
+
+    def test_without_contributions_listing(self, api_client: APIClient, capture_queries, cached_deleted_contributors):
+        ContributionFactory.create_batch(10)
+
+        with capture_queries() as queries:
+            response = api_client.get(self.url, {"include_contributions": "false"})
+
+        # the validator and the grouped aggregate
+        assert len(queries.statements) == 2
+        assert "contributions" not in response.json()["response"]
+
+
+class TestBulkDeleteContributions:
+    url = reverse("contributions_endpoint")
+
+    def test_filters(self, api_client: APIClient):
+        ali = ContributorFactory(name="ali")
+        ContributionFactory(contributor=ali, contribution_date=datetime.date(2023, 1, 1))
+        ContributionFactory(contributor=ali, contribution_date=datetime.date(2023, 2, 1))
+        kept = ContributionFactory(contributor=ContributorFactory(name="sara"))
+
+        response = api_client.delete(f"{self.url}?contributor=ali&start_year_month=2023-02")
+
+        assert response.status_code == 200
+        assert response.json()["deleted_per_month"] == {"2023-02": 1}
+        assert set(Contributions.objects.values_list("contributor__name", "contribution_date")) == {
+            ("ali", datetime.date(2023, 1, 1)),
+            ("sara", kept.contribution_date),
+        }
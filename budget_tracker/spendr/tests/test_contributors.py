@@ -0,0 +1,68 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, Contributors, MonthlyBudgetRollup, Tombstone
+from budget_tracker.spendr.tests.factories import ContributionFactory, ContributorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestDeleteContributor:
+    url = reverse("contributors_endpoint")
+    purges_url = reverse("contributor_purges_endpoint")
+
+    @pytest.fixture
+    def ali(self):
+        contributor = ContributorFactory(name="ali")
+        ContributionFactory.create_batch(3, contributor=contributor, contribution_amount=100)
+        MonthlyBudgetRollup.objects.rebuild()
+        return contributor
+
+    def test_delete_hides_the_contributor_at_once(self, api_client: APIClient, ali):
+        response = api_client.delete(f"{self.url}?contributor=Ali")
+
+        assert response.status_code == 200
+        assert api_client.get(self.url).json()["contributors"] == []
+        assert api_client.get(reverse("contributions_endpoint")).json()["response"]["total_contributions"] is None
+        assert MonthlyBudgetRollup.objects.get(month=datetime.date(2023, 1, 1)).total_contribution == 0
+        assert Tombstone.objects.filter(resource="contributors", key="ali").exists()
+        # the rows are left to the purge
+        assert Contributions.all_objects.count() == 3
+
+        purges = api_client.get(self.purges_url, {"purge_id": response.json()["purge_id"]}).json()["purges"]
+        assert [(purge["contributor"], purge["status"], purge["total_contributions"]) for purge in purges] == [
+            ("Ali", "pending", 3)
+        ]
+
+    def test_purge_in_batches(self, api_client: APIClient, ali):
+        api_client.delete(f"{self.url}?contributor=ali")
+        # a contributor of the same name created meanwhile is not purged
+        api_client.post(f"{self.url}?contributor=ali")
+        out = StringIO()
+
+        call_command("purge_contributors", batch_size=2, stdout=out)
+
+        assert "ali: 2/3 contributions purged" in out.getvalue()
+        assert not Contributions.all_objects.exists()
+        assert list(Contributors.all_objects.values_list("name", "deleted_at")) == [("ali", None)]
+        assert Tombstone.objects.filter(resource="contributions").count() == 3
+
+        [purge] = api_client.get(self.purges_url).json()["purges"]
+        assert (purge["status"], purge["purged_contributions"]) == ("done", 3)
+
+
+class TestRenameContributor:
+    def test_rename_updates_the_contributions(self):
+        contributor = ContributorFactory(name="ali")
+        contribution = ContributionFactory(contributor=contributor)
+        assert (contribution.contributor_name, contribution.year_month) == ("Ali", "2023-01")
+
+        contributor.name = "ali raza"
+        contributor.save()
+
+        assert Contributions.objects.get().contributor_name == "Ali Raza"
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr import events
+
+pytestmark = pytest.mark.django_db
+
+
+class Publisher:
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel, message):
+        self.messages.append((channel, json.loads(message)))
+
+
+class TestChangeEvents:
+    url = reverse("expenses_endpoint")
+
+    @pytest.fixture
+    def publisher(self, settings, monkeypatch):
+        settings.SPENDR_EVENTS_REDIS_URL = "redis://localhost:6379/0"
+        publisher = Publisher()
+        monkeypatch.setattr(events, "get_publisher", lambda: publisher)
+        return publisher
+
+    def test_write_publishes_its_months_on_commit(
+        self, api_client: APIClient, publisher, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            api_client.post(f"{self.url}?item_name=milk&item_price=25&date=2023-01-10")
+
+        assert publisher.messages == []
+        for callback in callbacks:
+            callback()
+        assert publisher.messages == [
+            (events.EVENTS_CHANNEL, {"type": "change", "resource": "expenses", "months": ["2023-01"]})
+        ]
+
+    def test_contributors_are_not_pushed(self, publisher, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            events.publish_change("contributors")
+
+        assert publisher.messages == []
+
+    def test_slow_subscriber_gets_a_resync(self):
+        broadcaster = events.Broadcaster()
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=2)
+        broadcaster.queues.add(queue)
+
+        for _ in range(3):
+            broadcaster.broadcast(events.get_change_event("expenses"))
+
+        assert queue.qsize() == 1
+        assert queue.get_nowait() == events.RESYNC
+
+    def test_stream_requires_authentication(self):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": events.EVENTS_PATH, "headers": []}
+        asyncio.run(events.stream_events(scope, None, send))
+
+        assert messages[0]["status"] == 403
@@ -0,0 +1,243 @@
+import datetime
+import threading
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, connections, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Expenses, MonthlyBudgetRollup, Tombstone
+from budget_tracker.spendr.pagination import EXPENSES_ORDERING
+from budget_tracker.spendr.tests.factories import ExpenseFactory
+from budget_tracker.spendr.utils import aggregate_expenses, get_expenses_initial_query, run_concurrently
+
+pytestmark = pytest.mark.django_db
+
+
+class TestAggregateExpenses:
+    def test_totals_and_percentages(self):
+        ExpenseFactory(item_name="milk", item_price=10, item_quantity=3)
+        ExpenseFactory(item_name="milk", item_price=20)
+        ExpenseFactory(item_name="bread", item_price=50)
+
+        total_expenses, expense_per_item = aggregate_expenses(Expenses.objects.all())
+
+        assert total_expenses == 100
+        assert expense_per_item == {
+            "bread": {"grand_total": 50, "percentage": 50.0},
+            "milk": {"grand_total": 50, "percentage": 50.0},
+        }
+
+    def test_empty_queryset(self):
+        assert aggregate_expenses(Expenses.objects.all()) == (None, {})
+
+    def test_single_query(self, django_assert_num_queries):
+        ExpenseFactory.create_batch(5)
+
+        with django_assert_num_queries(1):
+            aggregate_expenses(Expenses.objects.order_by("-date_added"))
+
+
+class TestTotalPrice:
+    def test_set_on_bulk_create(self):
+        Expenses.objects.bulk_create(
+            [Expenses(added_by="test", item_name="milk", item_price=10, item_quantity=3) for _ in range(2)]
+        )
+
+        assert list(Expenses.objects.values_list("total_price", flat=True)) == [30, 30]
+
+    def test_set_on_queryset_update(self):
+        expense = ExpenseFactory(item_price=10, item_quantity=1)
+
+        Expenses.objects.filter(pk=expense.pk).update(item_quantity=4)
+        expense.refresh_from_db()
+        assert expense.total_price == 40
+
+        # Writing total_price directly is overridden as well
+        Expenses.objects.filter(pk=expense.pk).update(total_price=1)
+        expense.refresh_from_db()
+        assert expense.total_price == 40
+
+    def test_constraint(self):
+        expense = ExpenseFactory(item_price=10, item_quantity=2)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ALTER TABLE spendr_expenses DISABLE TRIGGER spendr_expenses_total_price")
+            with pytest.raises(IntegrityError), transaction.atomic():
+                cursor.execute("UPDATE spendr_expenses SET total_price = 1 WHERE id = %s", [expense.pk])
+            cursor.execute("ALTER TABLE spendr_expenses ENABLE TRIGGER spendr_expenses_total_price")
+
+
+class TestRunConcurrently:
+    def get_backend_pid(self, barrier=None):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        if barrier:
+            # both queries are running at the same time
+            barrier.wait()
+        return pid
+
+    @pytest.fixture
+    def concurrent_queries(self, settings):
+        settings.SPENDR_CONCURRENT_QUERIES = True
+
+    @pytest.mark.django_db(transaction=True)
+    def test_outside_a_transaction_queries_use_their_own_connection(self, concurrent_queries):
+        barrier = threading.Barrier(2, timeout=5)
+        pids = run_concurrently(lambda: self.get_backend_pid(barrier), lambda: self.get_backend_pid(barrier))
+
+        assert len({*pids, self.get_backend_pid()}) == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_threads_close_their_connections(self, concurrent_queries):
+        def get_connection():
+            self.get_backend_pid()
+            return connections[DEFAULT_DB_ALIAS]
+
+        wrappers = run_concurrently(get_connection, get_connection)
+
+        assert all(wrapper.connection is None for wrapper in wrappers)
+
+    def test_inside_a_transaction_queries_share_the_connection(self, concurrent_queries):
+        pids = run_concurrently(self.get_backend_pid, self.get_backend_pid)
+
+        assert set(pids) == {self.get_backend_pid()}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_without_concurrent_queries_they_share_the_connection(self):
+        # The persistent connection of the request thread is kept, none is opened for the queries
+        pid = self.get_backend_pid()
+        pids = run_concurrently(self.get_backend_pid, self.get_backend_pid)
+
+        assert set(pids) == {pid}
+        assert connection.connection is not None
+
+
+class TestExpensesIndexes:
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            # the tables are tiny, stop the planner from preferring a scan followed by a sort,
+            # a Sort node can then only show up when no index serves the order
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            return queryset.explain()
+
+    @pytest.mark.parametrize(
+        "filters, index_name",
+        [
+            ({}, "expense_date_price_idx"),
+            ({"start_date": "2023-01-01", "end_date": "2023-01-31"}, "expense_date_price_idx"),
+            ({"item_name": "milk"}, "expense_item_date_price_idx"),
+            ({"added_by": "ali", "start_date": "2023-01-01"}, "expense_added_by_date_idx"),
+        ],
+    )
+    def test_listing_order_served_by_index(self, filters, index_name):
+        ExpenseFactory.create_batch(5)
+        arguments = {"item_name": None, "start_date": None, "end_date": None, "added_by": None} | filters
+        queryset = get_expenses_initial_query(**arguments).order_by(*EXPENSES_ORDERING)
+
+        plan = self.explain(queryset)
+
+        assert index_name in plan
+        assert "Sort" not in plan
+
+
+class TestListExpenses:
+    url = reverse("expenses_endpoint")
+
+    def test_list(self, api_client: APIClient):
+        ExpenseFactory(item_name="milk", item_price=30, date_added=datetime.date(2023, 1, 2))
+        ExpenseFactory(item_name="bread", item_price=10, date_added=datetime.date(2023, 1, 1))
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        data = response.json()["response"]
+        assert [expense["item_name"] for expense in data["expenses"]] == ["milk", "bread"]
+        assert data["total_expenses"] == 40
+        assert data["expense_per_item"]["milk"] == {"grand_total": 30, "percentage": 75.0}
+
+    def test_dates_without_leading_zeros(self, api_client: APIClient):
+        ExpenseFactory(item_price=30, date_added=datetime.date(2023, 1, 5))
+        ExpenseFactory(item_price=10, date_added=datetime.date(2023, 2, 2))
+
+        response = api_client.get(self.url, {"start_date": "2023-1-5", "end_date": "2023-2-1"})
+
+        assert response.status_code == 200
+        assert response.json()["response"]["total_expenses"] == 30
+
+    @pytest.mark.parametrize("params", [{"start_date": "2023-13-01"}, {"end_date": "2023-02-30"}])
+    def test_invalid_dates(self, api_client: APIClient, params):
+        assert api_client.get(self.url, params).status_code == 400
+
+    def test_query_count(self, api_client: APIClient, capture_queries):
+        ExpenseFactory.create_batch(20)
+
+        # validator, listing and the grouped aggregate, the grand total no longer needs its own scan
+        with capture_queries() as queries:
+            api_client.get(self.url)
+
+        assert len(queries.statements) == 3
+
+    def test_without_expenses_listing(self, api_client: APIClient, capture_queries):
+        ExpenseFactory.create_batch(20)
+
+        with capture_queries() as queries:
+            response = api_client.get(self.url, {"include_expenses": "false"})
+
+        assert len(queries.statements) == 2
+
+        data = response.json()["response"]
+        assert "expenses" not in data
+        assert data["total_expenses"] == sum(Expenses.objects.values_list("total_price", flat=True))
+
+
+class TestBulkDeleteExpenses:
+    url = reverse("expenses_endpoint")
+
+    def test_unique_ids(self, api_client: APIClient, capture_queries, cached_deleted_contributors):
+        kept, *deleted = ExpenseFactory.create_batch(3)
+        missing = "00000000-0000-0000-0000-000000000000"
+        ids = [str(expense.unique_id) for expense in deleted]
+
+        with capture_queries() as queries:
+            response = api_client.delete(f"{self.url}?unique_id={ids[0]},{missing}&unique_id={ids[1]}")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "message": "2 expenses have been deleted",
+            "deleted": 2,
+            "deleted_per_month": {"2023-01": 2},
+            "dry_run": False,
+            "not_found": [missing],
+        }
+        # the DELETE, the tombstones and the rollup refresh
+        assert len(queries.statements) == 5
+        assert list(Expenses.objects.all()) == [kept]
+        assert set(Tombstone.objects.values_list("key", flat=True)) == set(ids)
+        assert MonthlyBudgetRollup.objects.get(month=datetime.date(2023, 1, 1)).total_expenses == kept.total_price
+
+    def test_filters_dry_run(self, api_client: APIClient):
+        ExpenseFactory.create_batch(2, item_name="milk", date_added=datetime.date(2023, 1, 5))
+        ExpenseFactory(item_name="milk", date_added=datetime.date(2023, 3, 5))
+        ExpenseFactory(item_name="bread")
+
+        response = api_client.delete(f"{self.url}?item_name=Milk&dry_run=true")
+
+        assert response.json()["deleted_per_month"] == {"2023-01": 2, "2023-03": 1}
+        assert Expenses.objects.count() == 4
+
+        response = api_client.delete(f"{self.url}?item_name=Milk&end_date=2023-02-01")
+
+        assert response.json()["deleted"] == 2
+        assert sorted(Expenses.objects.values_list("item_name", flat=True)) == ["bread", "milk"]
+
+    def test_invalid_unique_id(self, api_client: APIClient):
+        expense = ExpenseFactory()
+
+        response = api_client.delete(f"{self.url}?unique_id={expense.unique_id},garbage")
+
+        assert response.status_code == 400
+        assert Expenses.objects.exists()
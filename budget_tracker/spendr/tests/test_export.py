@@ -0,0 +1,55 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.tests.factories import ContributionFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestExport:
+    url = reverse("export_endpoint")
+
+    def get_content(self, response):
+        assert response.status_code == 200
+        assert response.streaming
+        return b"".join(response.streaming_content).decode()
+
+    def test_expenses_csv(self, api_client: APIClient):
+        ExpenseFactory(item_name="milk", item_price=10, item_quantity=2, date_added=datetime.date(2023, 1, 2))
+        ExpenseFactory(item_name="bread", date_added=datetime.date(2023, 1, 1))
+
+        response = api_client.get(self.url, {"resource": "expenses", "start_date": "2023-01-02"})
+
+        rows = list(csv.DictReader(io.StringIO(self.get_content(response))))
+        assert response["Content-Type"] == "text/csv"
+        assert len(rows) == 1
+        assert rows[0]["item_name"] == "milk"
+        assert rows[0]["total_price"] == "20"
+
+    def test_contributions_ndjson(self, api_client: APIClient):
+        contribution = ContributionFactory(contributor__name="ali", contribution_amount=300)
+
+        response = api_client.get(self.url, {"resource": "contributions", "export_format": "ndjson"})
+
+        lines = self.get_content(response).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {
+                "unique_id": str(contribution.unique_id),
+                "contribution_date": "2023-01-01",
+                "contributor_name": "Ali",
+                "contribution_amount": 300,
+            }
+        ]
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"resource": "users"}, {"export_format": "xml"}, {"resource": "expenses", "end_date": "2023-13-01"}],
+    )
+    def test_invalid_parameters(self, api_client: APIClient, params):
+        assert api_client.get(self.url, params).status_code == 400
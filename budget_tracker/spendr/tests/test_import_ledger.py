@@ -0,0 +1,79 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, MonthlyBudgetRollup
+from budget_tracker.spendr.tests.factories import ContributorFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestImportLedger:
+    def test_import(self, tmp_path):
+        expenses = tmp_path / "expenses.csv"
+        expenses.write_text(
+            "date_added,item_name,item_price,item_quantity,added_by\n"
+            "2023-01-05,Milk,10,3,ali\n"
+            "2023-02-01,bread,4,,sara\n"
+        )
+        contributions = tmp_path / "contributions.csv"
+        contributions.write_text(
+            "contribution_date,contributor,contribution_amount\n2023-01-15,Ali,100\n2023-01-01,sara,50\n"
+        )
+        ali = ContributorFactory(name="ali")
+        out = StringIO()
+
+        call_command("import_ledger", expenses=str(expenses), contributions=str(contributions), stdout=out)
+
+        assert "Imported 2 expenses" in out.getvalue()
+        assert "rows/s" in out.getvalue()
+        assert sorted(Expenses.objects.values_list("item_name", "total_price")) == [("bread", 4), ("milk", 30)]
+        assert Contributors.objects.count() == 2
+        assert Contributions.objects.get(contributor=ali).contribution_date == datetime.date(2023, 1, 1)
+        assert list(
+            MonthlyBudgetRollup.objects.order_by("month").values_list("total_expenses", "total_contribution")
+        ) == [
+            (30, 150),
+            (4, 0),
+        ]
+
+    def test_contributions_without_contributor(self, tmp_path):
+        contributions = tmp_path / "contributions.csv"
+        contributions.write_text(
+            "contribution_date,contributor,contribution_amount\n2023-01-01,ali,100\n2023-01-01,,50\n2023-01-01, ,20\n"
+        )
+        out = StringIO()
+
+        call_command("import_ledger", contributions=str(contributions), stdout=out)
+
+        assert "Imported 1 contributions" in out.getvalue()
+        assert "Skipped 2 contributions without a contributor" in out.getvalue()
+        assert list(Contributors.objects.values_list("name", flat=True)) == ["ali"]
+        assert MonthlyBudgetRollup.objects.get().total_contribution == 100
+
+    def test_contributions_without_date(self, tmp_path):
+        contributions = tmp_path / "contributions.csv"
+        contributions.write_text(
+            "contribution_date,contributor,contribution_amount\n2023-01-01,ali,100\n,ali,50\n,sara,20\n,,10\n"
+        )
+        out = StringIO()
+
+        call_command("import_ledger", contributions=str(contributions), stdout=out)
+
+        assert "Imported 1 contributions" in out.getvalue()
+        assert "Skipped 3 contributions without a date" in out.getvalue()
+        assert "without a contributor" not in out.getvalue()
+        assert not Contributions.objects.filter(contribution_date=None).exists()
+        assert list(Contributors.objects.values_list("name", flat=True)) == ["ali"]
+        assert MonthlyBudgetRollup.objects.get().total_contribution == 100
+
+    def test_invalid_file_imports_nothing(self, tmp_path):
+        expenses = tmp_path / "expenses.csv"
+        expenses.write_text("date_added,item_name,item_price,item_quantity,added_by\nnot-a-date,milk,10,1,ali\n")
+
+        with pytest.raises(CommandError):
+            call_command("import_ledger", expenses=str(expenses))
+
+        assert not Expenses.objects.exists()
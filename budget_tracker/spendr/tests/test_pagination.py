@@ -0,0 +1,135 @@
+import datetime
+import uuid
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, Expenses
+from budget_tracker.spendr.pagination import (
+    CONTRIBUTIONS_ORDERING,
+    EXPENSES_ORDERING,
+    encode_cursor,
+    get_keyset_query,
+    paginate_queryset,
+)
+from budget_tracker.spendr.tests.factories import ContributionFactory, ExpenseFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def collect_pages(api_client, url, key, params):
+    rows, cursor = [], None
+    while True:
+        response = api_client.get(url, params | ({"cursor": cursor} if cursor else {}))
+        assert response.status_code == 200
+        data = response.json()["response"]
+        rows.extend(data[key])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return rows, data
+
+
+def explain_page(queryset, ordering, values):
+    queryset = queryset.filter(get_keyset_query(ordering, values)).order_by(*ordering)[:10]
+    with connection.cursor() as cursor:
+        # the tables are tiny, stop the planner from preferring a scan followed by a sort
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        return queryset.explain()
+
+
+class TestKeysetPlans:
+    def test_expenses_page_starts_at_the_cursor(self):
+        ExpenseFactory.create_batch(5)
+
+        plan = explain_page(Expenses.objects.all(), EXPENSES_ORDERING, ["2023-01-01", "10", str(uuid.uuid4())])
+
+        assert "expense_date_price_idx" in plan
+        assert "Index Cond: (date_added <= '2023-01-01'::date)" in plan
+        assert "Sort" not in plan
+
+    def test_contributions_page_starts_at_the_cursor(self):
+        ContributionFactory.create_batch(5)
+
+        plan = explain_page(Contributions.objects.all(), CONTRIBUTIONS_ORDERING, ["2023-01-01", str(uuid.uuid4())])
+
+        assert "contribution_listing_idx" in plan
+        assert "Index Cond: (contribution_date <= '2023-01-01'::date)" in plan
+        assert "Sort" not in plan
+
+
+class TestExpensesPagination:
+    url = reverse("expenses_endpoint")
+
+    def test_pages_match_unpaginated_listing(self, api_client: APIClient):
+        # same date and total price for several rows, the unique_id breaks the ties
+        ExpenseFactory.create_batch(4, date_added=datetime.date(2023, 1, 2), item_price=10)
+        ExpenseFactory.create_batch(3, date_added=datetime.date(2023, 1, 1))
+
+        paged, data = collect_pages(api_client, self.url, "expenses", {"page_size": 2})
+        full = api_client.get(self.url).json()["response"]["expenses"]
+
+        assert paged == full
+        assert len({expense["unique_id"] for expense in paged}) == 7
+
+    def test_aggregates_cover_the_whole_filter(self, api_client: APIClient):
+        ExpenseFactory.create_batch(5, item_name="milk", item_price=10)
+
+        data = api_client.get(self.url, {"page_size": 2}).json()["response"]
+
+        assert len(data["expenses"]) == 2
+        assert data["next_cursor"]
+        assert data["total_expenses"] == 50
+        assert data["expense_per_item"]["milk"]["grand_total"] == 50
+
+    @pytest.mark.parametrize("params", [{"page_size": "0"}, {"page_size": "ten"}, {"cursor": "not-a-cursor"}])
+    def test_invalid_parameters(self, api_client: APIClient, params):
+        assert api_client.get(self.url, params).status_code == 400
+
+    def test_tampered_cursor(self, api_client: APIClient):
+        cursor = encode_cursor(["not-a-date", "1", "not-a-uuid"])
+
+        assert api_client.get(self.url, {"cursor": cursor}).status_code == 400
+
+
+class TestContributionsPagination:
+    url = reverse("contributions_endpoint")
+
+    def test_pages_match_unpaginated_listing(self, api_client: APIClient):
+        ContributionFactory.create_batch(3, contribution_date=datetime.date(2023, 2, 1))
+        ContributionFactory.create_batch(2, contribution_date=datetime.date(2023, 1, 1))
+
+        paged, data = collect_pages(api_client, self.url, "contributions", {"page_size": 2})
+        full = api_client.get(self.url).json()["response"]["contributions"]
+
+        assert paged == full
+        assert [contribution["year_month"] for contribution in paged] == ["2023-02"] * 3 + ["2023-01"] * 2
+        assert "contribution_date" not in paged[0]
+
+    def test_null_dates(self, api_client: APIClient):
+        ContributionFactory.create_batch(2, contribution_date=None)
+        ContributionFactory.create_batch(2, contribution_date=datetime.date(2023, 1, 1))
+
+        paged, data = collect_pages(api_client, self.url, "contributions", {"page_size": 1})
+        full = api_client.get(self.url).json()["response"]["contributions"]
+
+        assert paged == full
+        assert len({contribution["unique_id"] for contribution in paged}) == 4
+
+    @pytest.mark.parametrize("ordering", [("-contribution_date", "unique_id"), ("contribution_date", "unique_id")])
+    def test_null_dates_in_either_order(self, ordering):
+        ContributionFactory.create_batch(2, contribution_date=None)
+        ContributionFactory.create_batch(2, contribution_date=datetime.date(2023, 1, 1))
+        ContributionFactory(contribution_date=datetime.date(2023, 2, 1))
+
+        paged, cursor = [], None
+        while True:
+            rows, cursor = paginate_queryset(Contributions.objects.all(), ordering, ("unique_id",), cursor, 2)
+            paged.extend(rows)
+            if cursor is None:
+                break
+
+        assert paged == list(Contributions.objects.order_by(*ordering).values("unique_id"))
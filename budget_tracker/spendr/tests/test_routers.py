@@ -0,0 +1,103 @@
+import pytest
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributors
+from budget_tracker.spendr.routers import replica_reads
+from budget_tracker.spendr.tests.factories import ContributorFactory
+
+# Outside of the test transaction, which would keep the reads on the primary
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica_0"])
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.SPENDR_REPLICA_DATABASES = ["replica_0"]
+
+
+def read_from_replica(client, url):
+    primary, replica = CaptureQueriesContext(connections["default"]), CaptureQueriesContext(connections["replica_0"])
+    with primary, replica:
+        response = client.get(url)
+    assert response.status_code == 200
+    return bool(replica.captured_queries) and not primary.captured_queries
+
+
+class TestReplicaRouter:
+    def test_reads(self):
+        assert Contributors.objects.all().db == "default"
+
+        token = replica_reads.set(True)
+        try:
+            assert Contributors.objects.all().db == "replica_0"
+            with transaction.atomic():
+                assert Contributors.objects.all().db == "default"
+        finally:
+            replica_reads.reset(token)
+
+    def test_writes(self):
+        ContributorFactory(name="ali")
+
+        token = replica_reads.set(True)
+        try:
+            contributor = Contributors.objects.get(name="ali")
+            assert contributor._state.db == "replica_0"
+            contributor.name = "sara"
+            contributor.save()
+        finally:
+            replica_reads.reset(token)
+
+        assert Contributors.objects.using("default").filter(name="sara").exists()
+
+    def test_without_replicas(self, settings):
+        settings.SPENDR_REPLICA_DATABASES = []
+
+        token = replica_reads.set(True)
+        try:
+            assert Contributors.objects.all().db == "default"
+        finally:
+            replica_reads.reset(token)
+
+
+class TestReplicaReads:
+    url = reverse("contributors_endpoint")
+
+    def test_get_reads_from_replica(self, api_client: APIClient):
+        ContributorFactory(name="ali")
+
+        assert read_from_replica(api_client, self.url)
+        assert replica_reads.get() is False
+
+    def test_other_endpoints_read_from_primary(self, api_client: APIClient):
+        assert not read_from_replica(api_client, reverse("changes_endpoint"))
+
+    def test_pinned_to_primary_after_a_write(self, api_client: APIClient):
+        api_client.post(f"{self.url}?contributor=ali")
+
+        assert not read_from_replica(api_client, self.url)
+
+    def test_other_users_not_pinned(self, api_client: APIClient, django_user_model):
+        api_client.post(f"{self.url}?contributor=ali")
+
+        other_client = APIClient()
+        other_client.force_authenticate(user=django_user_model.objects.create_user(email="other@example.com"))
+        assert read_from_replica(other_client, self.url)
+
+    def test_replica_responses_not_cached(self, api_client: APIClient, django_user_model):
+        api_client.post(f"{self.url}?contributor=ali")
+        other_client = APIClient()
+        other_client.force_authenticate(user=django_user_model.objects.create_user(email="other@example.com"))
+
+        # The replica may not have the write yet, nor the responses cached from it
+        assert read_from_replica(other_client, self.url)
+        assert read_from_replica(other_client, self.url)
+
+        # and the writer reads it from the primary, never from the cache
+        for _ in range(2):
+            primary = CaptureQueriesContext(connections["default"])
+            with primary:
+                response = api_client.get(self.url)
+            assert response.json()["contributors"] == ["Ali"]
+            assert primary.captured_queries
@@ -0,0 +1,107 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from budget_tracker.spendr.models import Contributions, ContributorPurge, Contributors, Expenses, MonthlyBudgetRollup
+from budget_tracker.spendr.tests.factories import ContributorFactory, ExpenseFactory
+from budget_tracker.spendr.views import contributions, contributors, expenses
+
+# Without the test transaction, so that the requests run in the transactions of the views
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class FailedAfterWrite(Exception):
+    pass
+
+
+@pytest.fixture
+def fail_after_write(monkeypatch):
+    """
+    Make the views fail once they have written, when they invalidate the cached responses.
+    """
+
+    def invalidate(*args, **kwargs):
+        raise FailedAfterWrite
+
+    for module in (contributions, contributors, expenses):
+        monkeypatch.setattr(module, "invalidate", invalidate)
+
+
+@pytest.fixture
+def in_atomic_block(monkeypatch):
+    """
+    Record whether the expenses view queries the aggregates inside a transaction.
+    """
+    recorded = []
+    aggregate_expenses = expenses.aggregate_expenses
+
+    def record(*args, **kwargs):
+        recorded.append(connection.in_atomic_block)
+        return aggregate_expenses(*args, **kwargs)
+
+    monkeypatch.setattr(expenses, "aggregate_expenses", record)
+    return recorded
+
+
+class TestReads:
+    def test_get_outside_of_a_transaction(self, api_client: APIClient, in_atomic_block):
+        ExpenseFactory()
+
+        response = api_client.get(f"{reverse('expenses_endpoint')}?include_expenses=false")
+
+        assert response.status_code == 200
+        assert in_atomic_block == [False]
+
+    def test_write_inside_a_transaction(self, api_client: APIClient, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(expenses, "invalidate", lambda *args: recorded.append(connection.in_atomic_block))
+
+        response = api_client.post(f"{reverse('expenses_endpoint')}?item_name=milk&item_price=25&date=2023-01-10")
+
+        assert response.status_code == 200
+        assert recorded == [True]
+
+
+class TestWritesAtomic:
+    def test_create_expense(self, api_client: APIClient, fail_after_write):
+        with pytest.raises(FailedAfterWrite):
+            api_client.post(f"{reverse('expenses_endpoint')}?item_name=milk&item_price=25&date=2023-01-10")
+
+        assert not Expenses.objects.exists()
+        assert not MonthlyBudgetRollup.objects.filter(total_expenses__gt=0).exists()
+
+    def test_delete_expense(self, api_client: APIClient, fail_after_write):
+        expense = ExpenseFactory(item_price=25)
+
+        with pytest.raises(FailedAfterWrite):
+            api_client.delete(f"{reverse('expenses_endpoint')}?unique_id={expense.unique_id}")
+
+        assert Expenses.objects.filter(pk=expense.pk).exists()
+        assert MonthlyBudgetRollup.objects.get().total_expenses == 25
+
+    def test_bulk_create_expenses(self, api_client: APIClient, fail_after_write):
+        rows = [{"item_name": "milk", "item_price": 25, "date": "2023-01-10"}] * 3
+
+        with pytest.raises(FailedAfterWrite):
+            api_client.post(reverse("bulk_expenses_endpoint"), rows, format="json")
+
+        assert not Expenses.objects.exists()
+
+    def test_create_contribution(self, api_client: APIClient, fail_after_write):
+        ContributorFactory(name="ali")
+
+        with pytest.raises(FailedAfterWrite):
+            api_client.post(f"{reverse('contributions_endpoint')}?contributor=ali&month=1&contribution=100")
+
+        assert not Contributions.objects.exists()
+        assert not MonthlyBudgetRollup.objects.filter(total_contribution__gt=0).exists()
+
+    def test_delete_contributor(self, api_client: APIClient, fail_after_write):
+        ContributorFactory(name="ali")
+
+        with pytest.raises(FailedAfterWrite):
+            api_client.delete(f"{reverse('contributors_endpoint')}?contributor=ali")
+
+        assert Contributors.objects.filter(name="ali").exists()
+        assert not ContributorPurge.objects.exists()
@@ -1,10 +1,19 @@
 from django.urls import path
 
-from budget_tracker.spendr.views import budget_status, contributions, contributors, expenses
+from budget_tracker.spendr.views import batch, budget_status, changes, contributions, contributors, expenses, export
 
 urlpatterns = [
     path(route="contributors", view=contributors.ListCreateContributor.as_view(), name="contributors_endpoint"),
+    path(
+        route="contributors/purges",
+        view=contributors.ListContributorPurges.as_view(),
+        name="contributor_purges_endpoint",
+    ),
     path(route="contributions", view=contributions.ListCreateContribution.as_view(), name="contributions_endpoint"),
     path(route="expenses", view=expenses.ListCreateExpenses.as_view(), name="expenses_endpoint"),
+    path(route="expenses/bulk", view=expenses.BulkCreateExpenses.as_view(), name="bulk_expenses_endpoint"),
+    path(route="batch", view=batch.ApplyBatch.as_view(), name="batch_endpoint"),
+    path(route="changes", view=changes.ListChanges.as_view(), name="changes_endpoint"),
+    path(route="export", view=export.ExportData.as_view(), name="export_endpoint"),
     path(route="budget_status", view=budget_status.ListCreateBudgetStatus.as_view(), name="status_endpoint"),
 ]
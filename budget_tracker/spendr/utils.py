@@ -1,11 +1,26 @@
+import contextvars
 import datetime
 import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-from django.db.models import Q
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, Func, Q, Sum, Value
+from django.db.models.functions import NullIf, Round, TruncMonth
 from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from budget_tracker.spendr.models import Contributions, Expenses
+from budget_tracker.spendr.cache import invalidate
+from budget_tracker.spendr.models import Contributions, Expenses, MonthlyBudgetRollup, Tombstone
+from budget_tracker.spendr.routers import can_read_from_replicas, pin_to_primary, primary_pinned, replica_reads
+
+MAX_ITEM_NAME_LENGTH = 255
+# Upper bound of the PositiveIntegerField holding total_price
+MAX_TOTAL_PRICE = 2147483647
+INVALID_DATE_MESSAGE = "Provide a valid date format: YYYY-MM-DD"
 
 
 def is_invalid_month(month):
@@ -32,12 +47,51 @@ def is_invalid_year(year):
     return Response({"message": error_response_message}, status=status.HTTP_400_BAD_REQUEST)
 
 
-def is_invalid_date(date):
+def parse_date(date):
+    """
+    Return the date of a YYYY-MM-DD string, or None when it is not a valid date.
+
+    The month and day may be given without their leading zero, as in 2023-1-5.
+    """
     try:
-        datetime.datetime.strptime(date, "%Y-%m-%d")
-        return False
+        return datetime.datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
-        return Response({"message": "Provide a valid date format: YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+        return None
+
+
+def is_invalid_date(date):
+    if parse_date(date) is None:
+        return Response({"message": INVALID_DATE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+    return False
+
+
+def validate_expense(item_name, item_price, date_added, item_quantity):
+    """
+    Validate an expense given as strings, returns its error message or None and the parsed date_added.
+    """
+    if not all((item_name, item_price)):
+        return "Both item_name and item_price are required", None
+
+    if len(item_name) > MAX_ITEM_NAME_LENGTH:
+        return f"item_name cannot be longer than {MAX_ITEM_NAME_LENGTH} characters", None
+
+    if not item_price.isdigit() or int(item_price) < 0:
+        return "Provide a valid item price value", None
+
+    date = None
+    if date_added:
+        date = parse_date(date_added)
+        if date is None:
+            return INVALID_DATE_MESSAGE, None
+
+    if item_quantity:
+        if not item_quantity.isdigit() or int(item_quantity) < 1:
+            return "Provide a valid item quantity value", None
+
+    if int(item_price) * int(item_quantity or 1) > MAX_TOTAL_PRICE:
+        return "The total price of the expense is too large", None
+
+    return None, date
 
 
 def is_invalid_year_month(year_month):
@@ -54,6 +108,18 @@ def is_invalid_year_month(year_month):
     return Response({"message": error_response_message}, status=status.HTTP_400_BAD_REQUEST)
 
 
+def get_first_day_of_month(year_month):
+    year, month = map(int, year_month.split("-"))
+    return datetime.date(year, month, 1)
+
+
+def get_first_day_of_next_month(year_month):
+    year, month = map(int, year_month.split("-"))
+    if month == 12:
+        return datetime.date(year + 1, 1, 1)
+    return datetime.date(year, month + 1, 1)
+
+
 def get_contribution_initial_query(contributor, start_year_month, end_year_month):
     query = Q()
 
@@ -61,12 +127,10 @@ def get_contribution_initial_query(contributor, start_year_month, end_year_month
         query = query & Q(contributor__name=contributor)
 
     if start_year_month:
-        year, month = start_year_month.split("-")
-        query = query & Q(contribution_date__year__gte=year, contribution_date__month__gte=month)
+        query = query & Q(contribution_date__gte=get_first_day_of_month(start_year_month))
 
     if end_year_month:
-        year, month = end_year_month.split("-")
-        query = query & Q(contribution_date__year__lte=year, contribution_date__month__lte=month)
+        query = query & Q(contribution_date__lt=get_first_day_of_next_month(end_year_month))
 
     return Contributions.objects.filter(query)
 
@@ -89,33 +153,264 @@ def get_expenses_initial_query(item_name, start_date, end_date, added_by):
     return Expenses.objects.filter(query)
 
 
-def aggregate_contributions_qs(queryset, total_contribution):
-    result = {}
-    for record in queryset:
-        contributor = record.get("contributor_name")
-        contribution = record.get("contribution_amount")
-
-        result.setdefault(contributor, {"amount": 0})
-
-        result[contributor]["amount"] += contribution
-
-    for key, value in result.items():
-        result[key]["percentage"] = round((value["amount"] * 100) / total_contribution, 2)
-
-    return result
-
-
-def aggregate_expenses_qs(queryset, total_expenses):
-    result = {}
-    for record in queryset:
-        item = record.get("item_name")
-        item_total_price = record.get("total_price")
-
-        result.setdefault(item, {"grand_total": 0})
-
-        result[item]["grand_total"] += item_total_price
-
-    for key, value in result.items():
-        result[key]["percentage"] = round((value["grand_total"] * 100) / total_expenses, 2)
-
-    return result
+class Capitalize(Func):
+    function = "INITCAP"
+    template = "%(function)s(%(expressions)s)"
+
+
+class SumOver(Func):
+    """
+    Sum of an expression across every row of the result set, computed as a window function.
+    """
+
+    function = "SUM"
+    template = "%(function)s(%(expressions)s) OVER ()"
+
+
+def get_share_expression(amount):
+    """
+    Percentage of ``amount`` in the grand total of the grouped query, rounded to two decimals.
+    """
+    return Round(
+        ExpressionWrapper(
+            amount * Value(100) / NullIf(SumOver(amount), Value(0)),
+            output_field=DecimalField(),
+        ),
+        2,
+    )
+
+
+def aggregate_contributions(queryset):
+    """
+    Return the grand total and the per contributor amounts and percentages of a contributions queryset.
+
+    Computed by the database in a single query grouped by the contributor display name.
+    """
+    grouped_qs = (
+        queryset.order_by()
+        .values("contributor_name")
+        .annotate(
+            amount=Sum("contribution_amount"),
+            percentage=get_share_expression(Sum("contribution_amount")),
+            total_contribution=SumOver(Sum("contribution_amount")),
+        )
+        .order_by("contributor_name")
+    )
+
+    total_contribution = None
+    contribution_per_contributor = {}
+    for record in grouped_qs:
+        total_contribution = record["total_contribution"]
+        percentage = record["percentage"]
+        contribution_per_contributor[record["contributor_name"]] = {
+            "amount": record["amount"],
+            "percentage": float(percentage) if percentage is not None else None,
+        }
+
+    if total_contribution is not None:
+        total_contribution = int(total_contribution)
+
+    return total_contribution, contribution_per_contributor
+
+
+def aggregate_expenses(queryset):
+    """
+    Return the grand total and the per item totals and percentages of an expenses queryset.
+
+    Everything is computed by the database in a single grouped query, the grand total comes
+    from a window over the per item sums so no additional aggregate query is needed.
+    """
+    grouped_qs = (
+        queryset.order_by()
+        .values("item_name")
+        .annotate(
+            grand_total=Sum("total_price"),
+            percentage=get_share_expression(Sum("total_price")),
+            total_expenses=SumOver(Sum("total_price")),
+        )
+        .order_by("item_name")
+    )
+
+    total_expenses = None
+    expense_per_item = {}
+    for record in grouped_qs:
+        total_expenses = record["total_expenses"]
+        percentage = record["percentage"]
+        expense_per_item[record["item_name"]] = {
+            "grand_total": record["grand_total"],
+            "percentage": float(percentage) if percentage is not None else None,
+        }
+
+    if total_expenses is not None:
+        total_expenses = int(total_expenses)
+
+    return total_expenses, expense_per_item
+
+
+class AtomicWritesMixin(APIView):
+    """
+    Serve the GET, HEAD and OPTIONS requests of an APIView outside of the transaction ATOMIC_REQUESTS opens
+    around every view, each query committing on its own, and the other methods in one transaction as before.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            response = super().dispatch(request, *args, **kwargs)
+        # DRF set request.user while authenticating
+        pin_to_primary(getattr(request, "user", None))
+        return response
+
+
+class ReplicaReadsMixin(APIView):
+    """
+    Read from the replicas while serving the GET, HEAD and OPTIONS requests of an APIView, unless the user
+    wrote in the last seconds. Meant to be used with ``AtomicWritesMixin``, replicas are not read in a
+    transaction. The responses read from a replica are not cached and those of a pinned user are never
+    served from the cache.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        replica_token, pinned_token = replica_reads.set(False), primary_pinned.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(replica_token)
+            primary_pinned.reset(pinned_token)
+
+    def initial(self, request, *args, **kwargs):
+        # The authentication has read the token and user from the primary
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            return
+        if can_read_from_replicas(request.user):
+            replica_reads.set(True)
+        elif settings.SPENDR_REPLICA_DATABASES:
+            primary_pinned.set(True)
+
+
+QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=settings.SPENDR_QUERY_THREADS, thread_name_prefix="spendr-query")
+
+
+def run_concurrently(*functions):
+    """
+    Run independent read queries at the same time, each on a connection of its own, and return their results.
+
+    They run one after the other on the current connection instead unless SPENDR_CONCURRENT_QUERIES is set,
+    and always inside a transaction: other connections would neither read the same snapshot nor see its
+    uncommitted writes.
+    """
+    if len(functions) < 2 or not settings.SPENDR_CONCURRENT_QUERIES or connection.in_atomic_block:
+        return [function() for function in functions]
+    # Without persistent connections, release the ones of this thread while it waits: holding one while the
+    # queries wait for theirs would exhaust a bounded connection pool
+    close_old_connections()
+    # The queries are routed like the ones of the request, to the replicas or not
+    contexts = [contextvars.copy_context() for _ in functions]
+    return list(QUERY_EXECUTOR.map(run_query, contexts, functions))
+
+
+def run_query(context, function):
+    try:
+        return context.run(function)
+    finally:
+        # Kept open, the connection of every thread would add to the ones of the request threads. The pooled
+        # backend hands them back to the pool of the process instead.
+        connections.close_all()
+
+
+def get_unique_ids(query_params):
+    """
+    Return the unique_id query parameters, which can be repeated or comma separated.
+    """
+    return [unique_id for value in query_params.getlist("unique_id") for unique_id in value.split(",") if unique_id]
+
+
+def is_bulk_delete(query_params, filters):
+    """
+    Whether a delete request targets several rows: many unique_ids, filters or a dry run.
+    """
+    return (
+        query_params.get("dry_run", "false").lower() == "true"
+        or any(query_params.get(field) for field in filters)
+        or len(get_unique_ids(query_params)) > 1
+    )
+
+
+def is_invalid_unique_ids(unique_ids):
+    for unique_id in unique_ids:
+        try:
+            uuid.UUID(unique_id)
+        except ValueError:
+            return Response({"message": f"Invalid unique_id: {unique_id}"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def delete_returning(queryset, *fields):
+    """
+    Delete the rows of ``queryset`` with a single DELETE statement and return ``fields`` of the deleted rows.
+
+    Unlike ``QuerySet.delete()`` the rows are not fetched first and no model method runs, callers maintain the
+    rollups, tombstones and caches themselves.
+    """
+    opts = queryset.model._meta
+    quote_name = connection.ops.quote_name
+    select, params = queryset.order_by().values("pk").query.sql_with_params()
+    returning = ", ".join(quote_name(opts.get_field(field).column) for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote_name(opts.db_table)} WHERE {quote_name(opts.pk.column)} IN ({select}) "
+            f"RETURNING {returning}",
+            params,
+        )
+        return cursor.fetchall()
+
+
+def format_month(date):
+    return date.strftime("%Y-%m") if date else None
+
+
+def delete_in_bulk(resource, queryset, date_field, unique_ids, dry_run):
+    """
+    Delete every row of ``queryset``, or only count them on a dry run, and return the counts per month.
+    """
+    if dry_run:
+        counts = (
+            queryset.annotate(month=TruncMonth(date_field))
+            .order_by()
+            .values("month")
+            .annotate(count=Count("pk"))
+            .values_list("month", "count")
+        )
+        per_month = {format_month(month): count for month, count in counts}
+        found = set(queryset.values_list("unique_id", flat=True)) if unique_ids else set()
+    else:
+        rows = delete_returning(queryset, "unique_id", date_field)
+        dates = {date for _, date in rows}
+        # The DELETE bypassed the model methods recording tombstones and maintaining the rollups
+        Tombstone.objects.record(resource, [unique_id for unique_id, _ in rows])
+        MonthlyBudgetRollup.objects.refresh_months(dates)
+        invalidate(resource, dates)
+
+        per_month = {}
+        for _, date in rows:
+            month = format_month(date)
+            per_month[month] = per_month.get(month, 0) + 1
+        found = {unique_id for unique_id, _ in rows}
+
+    count = sum(per_month.values())
+    per_month = dict(sorted(per_month.items(), key=lambda item: item[0] or ""))
+    response_dict = {
+        "message": f"{count} {resource} {'would be' if dry_run else 'have been'} deleted",
+        "deleted": count,
+        "deleted_per_month": per_month,
+        "dry_run": dry_run,
+    }
+    if unique_ids:
+        response_dict["not_found"] = [unique_id for unique_id in unique_ids if uuid.UUID(unique_id) not in found]
+    return Response(response_dict, status=status.HTTP_200_OK)
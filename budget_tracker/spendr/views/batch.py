@@ -0,0 +1,238 @@
+import datetime
+import uuid
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from budget_tracker.spendr.cache import invalidate
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, MonthlyBudgetRollup, Tombstone
+from budget_tracker.spendr.utils import MAX_TOTAL_PRICE, AtomicWritesMixin, is_invalid_month, validate_expense
+
+MAX_BATCH_OPERATIONS = 10000
+BATCH_SIZE = 1000
+
+OPERATIONS = ("create_expense", "delete_expense", "create_contribution", "delete_contribution", "create_contributor")
+
+
+def get_text(operation, field):
+    value = operation.get(field)
+    return str(value) if value not in (None, "") else None
+
+
+def get_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class Batch:
+    """
+    The writes of a list of operations, checked one after the other against the rows they reference.
+    """
+
+    def __init__(self, operations, added_by):
+        self.added_by = added_by
+        self.today = datetime.date.today()
+
+        self.new_contributors = {}
+        self.new_contributions = []
+        self.new_expenses = []
+        self.deleted_expenses = {}
+        self.deleted_contributions = {}
+
+        # Rows referenced by the operations, locked until the batch is applied
+        names = {get_text(operation, "contributor").lower() for operation in operations if operation["contributor"]}
+        self.contributors = {
+            contributor.name: contributor
+            for contributor in Contributors.objects.select_for_update().filter(name__in=names)
+        }
+        self.expenses = dict(
+            Expenses.objects.select_for_update()
+            .filter(unique_id__in=self.get_deleted_ids(operations, "delete_expense"))
+            .values_list("unique_id", "date_added")
+        )
+        self.contributions = dict(
+            Contributions.objects.select_for_update()
+            .filter(unique_id__in=self.get_deleted_ids(operations, "delete_contribution"))
+            .values_list("unique_id", "contribution_date")
+        )
+
+    def get_deleted_ids(self, operations, op):
+        unique_ids = (get_uuid(operation["unique_id"]) for operation in operations if operation["op"] == op)
+        return [unique_id for unique_id in unique_ids if unique_id]
+
+    def add(self, operation):
+        """
+        Add an operation to the batch, returns the status, message and unique_id of its result.
+        """
+        return getattr(self, operation["op"])(operation)
+
+    def create_expense(self, operation):
+        values = {field: get_text(operation, field) for field in ("item_name", "item_price", "date", "item_quantity")}
+        error, date_added = validate_expense(
+            values["item_name"], values["item_price"], values["date"], values["item_quantity"]
+        )
+        if error:
+            return status.HTTP_400_BAD_REQUEST, error, None
+
+        expense = Expenses(
+            added_by=self.added_by,
+            item_name=values["item_name"].lower(),
+            item_price=int(values["item_price"]),
+            item_quantity=int(values["item_quantity"] or 1),
+            date_added=date_added or self.today,
+        )
+        self.new_expenses.append(expense)
+        return status.HTTP_201_CREATED, f"Expense has been saved for {values['item_name']}", expense.unique_id
+
+    def create_contribution(self, operation):
+        contributor, month, contribution = (
+            get_text(operation, field) for field in ("contributor", "month", "contribution")
+        )
+        if not all((contributor, month, contribution)):
+            return status.HTTP_400_BAD_REQUEST, "Please provide all fields: contributor, month, contribution", None
+
+        response = is_invalid_month(month)
+        if response:
+            return status.HTTP_400_BAD_REQUEST, response.data["message"], None
+
+        if not contribution.isdigit() or int(contribution) > MAX_TOTAL_PRICE:
+            return status.HTTP_400_BAD_REQUEST, f"Invalid contribution: {contribution}", None
+
+        contributor_obj = self.contributors.get(contributor.lower())
+        if contributor_obj is None:
+            return status.HTTP_400_BAD_REQUEST, f"Contributor {contributor} does not exist", None
+
+        contribution_obj = Contributions(
+            contributor=contributor_obj,
+            contribution_amount=int(contribution),
+            contribution_date=datetime.date(self.today.year, int(month), 1),
+        )
+        contribution_obj.denormalize()
+        self.new_contributions.append(contribution_obj)
+        return status.HTTP_201_CREATED, f"Contribution for {contributor} has been saved", contribution_obj.unique_id
+
+    def create_contributor(self, operation):
+        contributor = get_text(operation, "contributor")
+        if not contributor:
+            return status.HTTP_400_BAD_REQUEST, "Please provide a contributor", None
+
+        name = contributor.lower()
+        if name not in self.contributors:
+            self.contributors[name] = self.new_contributors[name] = Contributors(name=name)
+        return status.HTTP_201_CREATED, f"Contributor {contributor} has been created", None
+
+    def delete_expense(self, operation):
+        return self.delete(operation, "Expense", self.expenses, self.deleted_expenses)
+
+    def delete_contribution(self, operation):
+        return self.delete(operation, "Contribution", self.contributions, self.deleted_contributions)
+
+    def delete(self, operation, label, existing, deleted):
+        unique_id = get_text(operation, "unique_id")
+        if not unique_id:
+            return status.HTTP_400_BAD_REQUEST, "Please provide a unique_id", None
+
+        key = get_uuid(unique_id)
+        if key is None:
+            return status.HTTP_400_BAD_REQUEST, f"Invalid unique_id: {unique_id}", None
+
+        # A row deleted by an earlier operation of the batch no longer exists
+        if key not in existing:
+            return status.HTTP_400_BAD_REQUEST, f"{label} {unique_id} does not exist", None
+
+        deleted[key] = existing.pop(key)
+        return status.HTTP_200_OK, f"{label} {unique_id} has been deleted", None
+
+    def apply(self):
+        """
+        Write the batch with one bulk insert and one DELETE per model.
+        """
+        Contributors.objects.bulk_create(self.new_contributors.values(), batch_size=BATCH_SIZE)
+        Contributions.objects.bulk_create(self.new_contributions, batch_size=BATCH_SIZE)
+        Expenses.objects.bulk_create(self.new_expenses, batch_size=BATCH_SIZE)
+
+        if self.deleted_expenses:
+            Expenses.objects.filter(unique_id__in=self.deleted_expenses).delete()
+            Tombstone.objects.record("expenses", self.deleted_expenses)
+        if self.deleted_contributions:
+            Contributions.objects.filter(unique_id__in=self.deleted_contributions).delete()
+            Tombstone.objects.record("contributions", self.deleted_contributions)
+
+        expense_dates = [expense.date_added for expense in self.new_expenses] + list(self.deleted_expenses.values())
+        contribution_dates = [contribution.contribution_date for contribution in self.new_contributions] + list(
+            self.deleted_contributions.values()
+        )
+
+        # Bulk writes do not go through the model methods maintaining the rollups
+        MonthlyBudgetRollup.objects.refresh_months(expense_dates + contribution_dates)
+        if expense_dates:
+            invalidate("expenses", expense_dates)
+        if contribution_dates:
+            invalidate("contributions", contribution_dates)
+        if self.new_contributors:
+            invalidate("contributors")
+
+
+class ApplyBatch(AtomicWritesMixin, APIView):
+    """
+    View to apply many operations at once.
+    """
+
+    def post(self, request):
+        """
+        Apply a JSON array of operations in order and in one transaction, returning the result of each.
+
+        Every operation has an ``op``, one of create_expense, delete_expense, create_contribution,
+        delete_contribution or create_contributor, and the fields of the query parameters of the matching
+        endpoint. Unless allow_partial=true is given, a single failing operation rejects the whole batch,
+        otherwise the other operations are applied.
+        """
+        allow_partial = request.query_params.get("allow_partial", "false").lower() == "true"
+        operations = request.data
+
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"message": "Provide a non-empty JSON array of operations"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return Response(
+                {"message": f"At most {MAX_BATCH_OPERATIONS} operations can be applied at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not all(isinstance(operation, dict) and operation.get("op") in OPERATIONS for operation in operations):
+            return Response(
+                {"message": f"Each operation must be an object with an op among: {', '.join(OPERATIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        operations = [{"contributor": None, "unique_id": None, **operation} for operation in operations]
+
+        with transaction.atomic():
+            batch = Batch(operations, request.user.name)
+
+            results = []
+            for index, operation in enumerate(operations):
+                status_, message, unique_id = batch.add(operation)
+                result = {"index": index, "op": operation["op"], "status": status_, "message": message}
+                if unique_id:
+                    result["unique_id"] = unique_id
+                results.append(result)
+
+            errors = [result for result in results if result["status"] == status.HTTP_400_BAD_REQUEST]
+            if errors and not allow_partial:
+                return Response(
+                    {"message": "No operations have been applied", "errors": errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            batch.apply()
+
+        return Response(
+            {"message": f"{len(results) - len(errors)} operations have been applied", "results": results},
+            status=status.HTTP_200_OK,
+        )
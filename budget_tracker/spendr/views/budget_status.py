@@ -1,50 +1,131 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from django.db.models import Sum
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from budget_tracker.spendr.models import Contributions, Expenses
-from budget_tracker.spendr.utils import is_invalid_year_month
+from budget_tracker.spendr.cache import cache_response, get_cached_response, get_response_cache_key
+from budget_tracker.spendr.conditional import get_not_modified_response, get_rows_validator_headers
+from budget_tracker.spendr.managers import get_next_month
+from budget_tracker.spendr.models import MonthlyBudgetRollup
+from budget_tracker.spendr.utils import (
+    AtomicWritesMixin,
+    ReplicaReadsMixin,
+    get_first_day_of_month,
+    is_invalid_year_month,
+)
 
+MAX_RANGE_MONTHS = 120
 
-class ListCreateBudgetStatus(APIView):
+
+class ListCreateBudgetStatus(ReplicaReadsMixin, AtomicWritesMixin, APIView):
     """
     View to list budget status
     """
 
     def get(self, request):
         """
-        Return a list of budget status.
+        Return the budget status of a month, or of every month between start_year_month and end_year_month.
         """
         query_params = request.query_params
 
+        if "start_year_month" in query_params or "end_year_month" in query_params:
+            return self.get_range(request)
+
         default_year_month = datetime.today().strftime("%Y-%m")
         year_month = query_params.get("year_month", default_year_month)
 
-        response_dict = {"year_month": year_month}
-
         year_month_validation_response = is_invalid_year_month(year_month)
         if year_month_validation_response:
             return year_month_validation_response
 
-        year, month = year_month.split("-")
+        month = get_first_day_of_month(year_month)
+        cache_key = get_response_cache_key("budget_status", query_params, get_budget_status_scopes([month]))
+        response = get_cached_response(cache_key)
+        if response:
+            return get_not_modified_response(request, response.headers) or response
+
+        rollups = list(MonthlyBudgetRollup.objects.filter(month=month))
+
+        validator_headers = get_rows_validator_headers(rollups)
+        response = get_not_modified_response(request, validator_headers)
+        if response:
+            return response
+
+        rollup = rollups[0] if rollups else None
+        response = Response({"response": get_budget_status(year_month, rollup)}, headers=validator_headers)
+        cache_response(cache_key, response)
+        return response
+
+    def get_range(self, request):
+        query_params = request.query_params
+
+        default_year_month = datetime.today().strftime("%Y-%m")
+        start_year_month = query_params.get("start_year_month", default_year_month)
+        end_year_month = query_params.get("end_year_month", default_year_month)
+
+        for year_month in (start_year_month, end_year_month):
+            year_month_validation_response = is_invalid_year_month(year_month)
+            if year_month_validation_response:
+                return year_month_validation_response
+
+        start_month = get_first_day_of_month(start_year_month)
+        end_month = get_first_day_of_month(end_year_month)
+
+        months: list[date] = []
+        month = start_month
+        while month <= end_month and len(months) <= MAX_RANGE_MONTHS:
+            months.append(month)
+            month = get_next_month(month)
+
+        if not months or len(months) > MAX_RANGE_MONTHS:
+            return Response(
+                {"message": f"Provide a range of 1 to {MAX_RANGE_MONTHS} months with start_year_month first"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = get_response_cache_key("budget_status", query_params, get_budget_status_scopes(months))
+        response = get_cached_response(cache_key)
+        if response:
+            return get_not_modified_response(request, response.headers) or response
+
+        rows = list(MonthlyBudgetRollup.objects.filter(month__gte=start_month, month__lte=end_month))
+
+        validator_headers = get_rows_validator_headers(rows)
+        response = get_not_modified_response(request, validator_headers)
+        if response:
+            return response
+
+        rollups = {rollup.month: rollup for rollup in rows}
+
+        response_dict = {
+            "start_year_month": start_year_month,
+            "end_year_month": end_year_month,
+            "budget_status": [get_budget_status(month.strftime("%Y-%m"), rollups.get(month)) for month in months],
+        }
+
+        response = Response({"response": response_dict}, headers=validator_headers)
+        cache_response(cache_key, response)
+        return response
+
+
+def get_budget_status_scopes(months):
+    return [("expenses", months), ("contributions", months)]
 
-        total_expenses = Expenses.objects.filter(date_added__year=year, date_added__month=month).aggregate(
-            total_expenses=Sum("item_price")
-        )["total_expenses"]
 
-        response_dict["total_expenses"] = total_expenses
+def get_budget_status(year_month, rollup):
+    response_dict = {"year_month": year_month}
 
-        total_contribution = Contributions.objects.filter(
-            contribution_date__year=year, contribution_date__month=month
-        ).aggregate(total_contribution=Sum("contribution_amount"))["total_contribution"]
+    # None when there are no rows to sum, like SUM() in SQL
+    total_expenses = rollup.total_expenses if rollup and rollup.expense_count else None
+    response_dict["total_expenses"] = total_expenses
 
-        response_dict["total_contribution"] = total_contribution
+    total_contribution = rollup.total_contribution if rollup and rollup.contribution_count else None
+    response_dict["total_contribution"] = total_contribution
 
-        if total_contribution and total_expenses:
-            response_dict["remaining_budget"] = total_contribution - total_expenses
-        else:
-            response_dict["remaining_budget"] = None
+    if total_contribution and total_expenses:
+        response_dict["remaining_budget"] = total_contribution - total_expenses
+    else:
+        response_dict["remaining_budget"] = None
 
-        return Response({"response": response_dict})
+    return response_dict
@@ -0,0 +1,145 @@
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BigIntegerField, F, Func, Value
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from budget_tracker.spendr.models import Contributions, Contributors, Expenses, Tombstone
+from budget_tracker.spendr.pagination import decode_cursor, encode_cursor, is_invalid_page_size
+from budget_tracker.spendr.utils import AtomicWritesMixin
+
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 1000
+
+# The rows are ordered by the transaction that last wrote them, see get_horizon()
+CHANGES_ORDERING = ("txid", "id")
+
+# The querysets are built for every request, the contributions one leaves out the contributors deleted meanwhile
+STREAMS = {
+    "expenses": (
+        lambda: Expenses.objects.all(),
+        ("unique_id", "date_added", "item_name", "item_price", "item_quantity", "total_price", "added_by", "modified"),
+    ),
+    "contributions": (
+        lambda: Contributions.objects.all(),
+        ("unique_id", "contribution_date", "contributor_name", "contribution_amount", "modified"),
+    ),
+    "contributors": (
+        lambda: Contributors.objects.all(),
+        ("name", "modified"),
+    ),
+    "deleted": (
+        lambda: Tombstone.objects.annotate(deleted_at=F("modified")),
+        ("resource", "key", "deleted_at"),
+    ),
+}
+
+
+class Row(Func):
+    """
+    Row constructor, compared column by column. ``Row(a, b) > Row(x, y)`` is a condition an index on
+    ``(a, b)`` starts its range at, unlike the equivalent ``a > x OR (a = x AND b > y)``.
+    """
+
+    template = "(%(expressions)s)"
+    output_field = BigIntegerField()
+
+
+def get_horizon():
+    """
+    Return the id of the oldest transaction still running.
+
+    Transaction ids are handed out when transactions start, not when they commit. Every transaction below
+    the horizon has ended, so no row can show up behind it anymore, while the rows written by the running
+    ones are held back until they end. A long transaction delays the feed, it never makes it skip rows.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def read_stream(queryset, fields, position, horizon, limit):
+    """
+    Return up to ``limit`` rows written after ``position`` by transactions below ``horizon``, the new
+    position and whether rows are left.
+    """
+    if position:
+        position = [int(value) for value in position]
+        queryset = queryset.alias(position=Row(*CHANGES_ORDERING)).filter(
+            position__gt=Row(*(Value(value) for value in position))
+        )
+
+    extra_fields = [field for field in CHANGES_ORDERING if field not in fields]
+    rows = list(
+        queryset.filter(txid__lt=horizon).order_by(*CHANGES_ORDERING).values(*fields, *extra_fields)[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if rows:
+        position = [rows[-1]["txid"], rows[-1]["id"]]
+
+    for row in rows:
+        for field in extra_fields:
+            del row[field]
+
+    return rows, position, has_more
+
+
+class ListChanges(AtomicWritesMixin, APIView):
+    """
+    View to list the changes made since a cursor.
+    """
+
+    def get(self, request):
+        """
+        Return the expenses, contributions and contributors created or modified, and the records deleted
+        since the ``since`` cursor, or since the beginning when it is not given.
+
+        Changes are returned in the order of their transactions, at most ``limit`` of each kind per call. Keep
+        calling with ``next_cursor`` while ``has_more`` is true. A record can show up more than once, so
+        clients must apply changes idempotently.
+        """
+        query_params = request.query_params
+
+        since = query_params.get("since")
+        limit = query_params.get("limit")
+
+        response = is_invalid_page_size(limit)
+        if response:
+            return response
+        limit = min(int(limit), MAX_CHANGES_LIMIT) if limit else DEFAULT_CHANGES_LIMIT
+
+        positions = [None] * len(STREAMS)
+        if since:
+            positions = decode_cursor(since, STREAMS)
+            if positions is None or not all(
+                position is None or (isinstance(position, list) and len(position) == len(CHANGES_ORDERING))
+                for position in positions
+            ):
+                return Response({"message": "Provide a valid since cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        horizon = get_horizon()
+        changes, next_positions, has_more = {}, [], False
+        for (name, (get_queryset, fields)), position in zip(STREAMS.items(), positions):
+            try:
+                rows, position, stream_has_more = read_stream(get_queryset(), fields, position, horizon, limit)
+            except (TypeError, ValueError, ValidationError):
+                return Response({"message": "Provide a valid since cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+            changes[name] = rows
+            next_positions.append(position)
+            has_more = has_more or stream_has_more
+
+        # Contributors are listed capitalized everywhere else
+        for contributor in changes["contributors"]:
+            contributor["name"] = contributor["name"] and contributor["name"].capitalize()
+        for deleted in changes["deleted"]:
+            if deleted["resource"] == "contributors":
+                deleted["key"] = deleted["key"].capitalize()
+
+        return Response(
+            {"changes": changes, "next_cursor": encode_cursor(next_positions), "has_more": has_more},
+            status=status.HTTP_200_OK,
+        )
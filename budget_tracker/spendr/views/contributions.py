@@ -1,21 +1,44 @@
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db.models import CharField, Func, Sum, Value
-from django.db.models.functions import Cast, Concat, ExtractMonth, ExtractYear, LPad
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from budget_tracker.spendr.cache import (
+    cache_response,
+    get_cached_response,
+    get_months_between,
+    get_response_cache_key,
+    invalidate,
+)
+from budget_tracker.spendr.conditional import get_not_modified_response, get_validator_headers
 from budget_tracker.spendr.models import Contributions, Contributors
+from budget_tracker.spendr.pagination import (
+    CONTRIBUTIONS_ORDERING,
+    get_page_size,
+    is_invalid_page_size,
+    is_pagination_requested,
+    paginate_queryset,
+)
 from budget_tracker.spendr.utils import (
-    aggregate_contributions_qs,
+    AtomicWritesMixin,
+    ReplicaReadsMixin,
+    aggregate_contributions,
+    delete_in_bulk,
     get_contribution_initial_query,
+    get_first_day_of_month,
+    get_unique_ids,
+    is_bulk_delete,
     is_invalid_month,
+    is_invalid_unique_ids,
     is_invalid_year_month,
+    run_concurrently,
 )
 
+CONTRIBUTIONS_FILTERS = ("contributor", "start_year_month", "end_year_month")
+
 
-class ListCreateContribution(APIView):
+class ListCreateContribution(ReplicaReadsMixin, AtomicWritesMixin, APIView):
     """
     View to list, create, or delete contributions.
     """
@@ -38,6 +61,9 @@ class ListCreateContribution(APIView):
         contributor = query_params.get("contributor")
         start_year_month = query_params.get("start_year_month")
         end_year_month = query_params.get("end_year_month")
+        include_contributions = query_params.get("include_contributions", "true").lower() != "false"
+        page_size = query_params.get("page_size")
+        cursor = query_params.get("cursor")
 
         response_dict = {}
 
@@ -50,26 +76,58 @@ class ListCreateContribution(APIView):
             if response:
                 return response
 
-        initial_query = get_contribution_initial_query(contributor, start_year_month, end_year_month)
+        response = is_invalid_page_size(page_size)
+        if response:
+            return response
+
+        months = None
+        if start_year_month and end_year_month:
+            months = get_months_between(
+                get_first_day_of_month(start_year_month), get_first_day_of_month(end_year_month)
+            )
+        cache_key = get_response_cache_key("contributions", query_params, [("contributions", months)])
+        response = get_cached_response(cache_key)
+        if response:
+            return get_not_modified_response(request, response.headers) or response
 
-        annotated_qs = initial_query.annotate(
-            year_month=Concat(
-                Cast(ExtractYear("contribution_date"), CharField()),
-                Value("-"),
-                LPad(Cast(ExtractMonth("contribution_date"), CharField()), 2, Value("0")),
-            ),
-            contributor_name=Capitalize("contributor__name"),
-        ).values("year_month", "contributor_name", "contribution_amount", "unique_id")
+        initial_query = get_contribution_initial_query(contributor, start_year_month, end_year_month)
 
-        response_dict["contributions"] = annotated_qs
+        validator_headers = get_validator_headers(initial_query)
+        response = get_not_modified_response(request, validator_headers)
+        if response:
+            return response
+
+        # year_month and contributor_name are stored on the rows, the listing reads no other table
+        fields = ("year_month", "contributor_name", "contribution_amount", "unique_id")
+        paginated = is_pagination_requested(query_params)
+
+        def list_contributions():
+            if paginated:
+                return paginate_queryset(
+                    initial_query, CONTRIBUTIONS_ORDERING, fields, cursor, get_page_size(page_size)
+                )
+            return list(initial_query.values(*fields).order_by(*CONTRIBUTIONS_ORDERING)), None
+
+        # The listing and the aggregates are independent queries
+        queries = [lambda: aggregate_contributions(initial_query)]
+        if include_contributions:
+            queries.append(list_contributions)
+        try:
+            (total_contribution, contribution_per_contributor), *listing = run_concurrently(*queries)
+        except ValidationError:
+            return Response({"message": "Provide a valid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if listing:
+            response_dict["contributions"], next_cursor = listing[0]
+            if paginated:
+                response_dict["next_cursor"] = next_cursor
 
-        total_contribution = annotated_qs.aggregate(total=Sum("contribution_amount"))["total"]
         response_dict["total_contributions"] = total_contribution
-
-        contribution_per_contributor = aggregate_contributions_qs(annotated_qs, total_contribution)
         response_dict["contribution_per_contributor"] = contribution_per_contributor
 
-        return Response({"response": response_dict}, status=status.HTTP_200_OK)
+        response = Response({"response": response_dict}, status=status.HTTP_200_OK, headers=validator_headers)
+        cache_response(cache_key, response)
+        return response
 
     def post(self, request):
         query_params = request.query_params
@@ -83,12 +141,12 @@ class ListCreateContribution(APIView):
             if response:
                 return response
 
-            contributor_obj = Contributors.objects.filter(name=contributor.lower())
-            contributor_obj = contributor_obj.first()
+            contributor_obj = Contributors.objects.filter(name=contributor.lower()).first()
 
             if contributor_obj:
                 contribution_obj = Contributions(contributor=contributor_obj, contribution_amount=contribution)
                 contribution_obj.save(month=month)
+                invalidate("contributions", [contribution_obj.contribution_date])
 
                 response = f"Contribution for {contributor} has been saved"
                 status_ = status.HTTP_201_CREATED
@@ -105,10 +163,15 @@ class ListCreateContribution(APIView):
 
     def delete(self, request):
         query_params = request.query_params
+        if is_bulk_delete(query_params, CONTRIBUTIONS_FILTERS):
+            return self.bulk_delete(request)
+
         unique_id = query_params.get("unique_id")
         if unique_id:
             try:
-                Contributions.objects.get(unique_id=unique_id).delete()
+                contribution = Contributions.objects.get(unique_id=unique_id)
+                contribution.delete()
+                invalidate("contributions", [contribution.contribution_date])
                 response = f"Contribution {unique_id} has been deleted"
                 status_ = status.HTTP_200_OK
             except ObjectDoesNotExist:
@@ -123,7 +186,31 @@ class ListCreateContribution(APIView):
 
         return Response({"message": response}, status=status_)
 
+    def bulk_delete(self, request):
+        """
+        Delete every contribution of the unique_ids and matching the filters with one DELETE statement.
+
+        With dry_run=true nothing is deleted, the response tells what would be.
+        """
+        query_params = request.query_params
+
+        start_year_month = query_params.get("start_year_month")
+        end_year_month = query_params.get("end_year_month")
+        dry_run = query_params.get("dry_run", "false").lower() == "true"
+        unique_ids = get_unique_ids(query_params)
+
+        for year_month in (start_year_month, end_year_month):
+            if year_month:
+                response = is_invalid_year_month(year_month)
+                if response:
+                    return response
+
+        response = is_invalid_unique_ids(unique_ids)
+        if response:
+            return response
+
+        queryset = get_contribution_initial_query(query_params.get("contributor"), start_year_month, end_year_month)
+        if unique_ids:
+            queryset = queryset.filter(unique_id__in=unique_ids)
 
-class Capitalize(Func):
-    function = "INITCAP"
-    template = "%(function)s(%(expressions)s)"
+        return delete_in_bulk("contributions", queryset, "contribution_date", unique_ids, dry_run)
@@ -3,10 +3,15 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from budget_tracker.spendr.models import Contributors
+from budget_tracker.spendr.cache import cache_response, get_cached_response, get_response_cache_key, invalidate
+from budget_tracker.spendr.conditional import get_not_modified_response, get_validator_headers
+from budget_tracker.spendr.models import ContributorPurge, Contributors
+from budget_tracker.spendr.utils import AtomicWritesMixin, ReplicaReadsMixin
 
+MAX_LISTED_PURGES = 100
 
-class ListCreateContributor(APIView):
+
+class ListCreateContributor(ReplicaReadsMixin, AtomicWritesMixin, APIView):
     """
     View to list, create, or delete contributors.
     """
@@ -15,10 +20,22 @@ class ListCreateContributor(APIView):
         """
         Return a list of all contributors.
         """
+        cache_key = get_response_cache_key("contributors", request.query_params, [("contributors", None)])
+        response = get_cached_response(cache_key)
+        if response:
+            return get_not_modified_response(request, response.headers) or response
+
+        validator_headers = get_validator_headers(Contributors.objects.all())
+        response = get_not_modified_response(request, validator_headers)
+        if response:
+            return response
+
         contributors = Contributors.objects.all().values_list("name", flat=True).order_by("name")
         contributors = [contributor.capitalize() for contributor in contributors]
 
-        return Response({"contributors": contributors}, status=status.HTTP_200_OK)
+        response = Response({"contributors": contributors}, status=status.HTTP_200_OK, headers=validator_headers)
+        cache_response(cache_key, response)
+        return response
 
     def post(self, request):
         query_params = request.query_params
@@ -27,6 +44,8 @@ class ListCreateContributor(APIView):
 
         if contributor:
             _, created = Contributors.objects.get_or_create(name=contributor.lower())
+            if created:
+                invalidate("contributors")
             response = f"Contributor {contributor} has been created"
             status_ = status.HTTP_201_CREATED
         else:
@@ -42,9 +61,15 @@ class ListCreateContributor(APIView):
 
         if contributor:
             try:
-                Contributors.objects.get(name=contributor.lower()).delete()
-                response = f"Contributor {contributor} has been deleted"
-                status_ = status.HTTP_200_OK
+                # Hidden at once, the rows are purged by the purge_contributors command
+                purge = Contributors.objects.get(name=contributor.lower()).soft_delete()
+                invalidate("contributors")
+                # the contributor's contributions went with it, in any month
+                invalidate("contributions")
+                return Response(
+                    {"message": f"Contributor {contributor} has been deleted", "purge_id": purge.pk},
+                    status=status.HTTP_200_OK,
+                )
             except ObjectDoesNotExist:
                 response = f"Contributor {contributor} does not exist"
                 status_ = status.HTTP_404_NOT_FOUND
@@ -53,3 +78,39 @@ class ListCreateContributor(APIView):
             status_ = status.HTTP_400_BAD_REQUEST
 
         return Response({"message": response}, status=status_)
+
+
+class ListContributorPurges(AtomicWritesMixin, APIView):
+    """
+    View to follow the purge of deleted contributors.
+    """
+
+    def get(self, request):
+        """
+        Return the progress of the most recent purges, or of the purge given by purge_id.
+        """
+        purge_id = request.query_params.get("purge_id")
+
+        purges = ContributorPurge.objects.order_by("-pk")
+        if purge_id:
+            if not purge_id.isdigit():
+                return Response({"message": "Provide a valid purge_id"}, status=status.HTTP_400_BAD_REQUEST)
+            purges = purges.filter(pk=purge_id)
+
+        return Response(
+            {
+                "purges": [
+                    {
+                        "purge_id": purge.pk,
+                        "contributor": purge.name and purge.name.capitalize(),
+                        "status": purge.status,
+                        "total_contributions": purge.total_contributions,
+                        "purged_contributions": purge.purged_contributions,
+                        "created": purge.created,
+                        "finished": purge.finished,
+                    }
+                    for purge in purges[:MAX_LISTED_PURGES]
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -1,14 +1,51 @@
+import csv
+import datetime
+import io
+
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db.models import Sum
+from django.db import transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from budget_tracker.spendr.models import Expenses
-from budget_tracker.spendr.utils import aggregate_expenses_qs, get_expenses_initial_query, is_invalid_date
+from budget_tracker.spendr.cache import (
+    cache_response,
+    get_cached_response,
+    get_months_between,
+    get_response_cache_key,
+    invalidate,
+)
+from budget_tracker.spendr.conditional import get_not_modified_response, get_validator_headers
+from budget_tracker.spendr.models import Expenses, MonthlyBudgetRollup
+from budget_tracker.spendr.pagination import (
+    EXPENSES_ORDERING,
+    get_page_size,
+    is_invalid_page_size,
+    is_pagination_requested,
+    paginate_queryset,
+)
+from budget_tracker.spendr.utils import (
+    INVALID_DATE_MESSAGE,
+    AtomicWritesMixin,
+    ReplicaReadsMixin,
+    aggregate_expenses,
+    delete_in_bulk,
+    get_expenses_initial_query,
+    get_unique_ids,
+    is_bulk_delete,
+    is_invalid_date,
+    is_invalid_unique_ids,
+    parse_date,
+    run_concurrently,
+    validate_expense,
+)
+
+MAX_BULK_EXPENSES = 10000
+BULK_CREATE_BATCH_SIZE = 1000
+EXPENSES_FILTERS = ("item_name", "start_date", "end_date", "added_by")
 
 
-class ListCreateExpenses(APIView):
+class ListCreateExpenses(ReplicaReadsMixin, AtomicWritesMixin, APIView):
     """
     View to list, create, or delete contributors.
     """
@@ -23,34 +60,68 @@ class ListCreateExpenses(APIView):
         start_date = query_params.get("start_date")
         end_date = query_params.get("end_date")
         added_by = query_params.get("added_by")
+        include_expenses = query_params.get("include_expenses", "true").lower() != "false"
+        page_size = query_params.get("page_size")
+        cursor = query_params.get("cursor")
 
         response_dict = {}
 
+        # Parsed once, the dates are validated and used with the same format
         if start_date:
-            response = is_invalid_date(start_date)
-            if response:
-                return response
+            start_date = parse_date(start_date)
+            if start_date is None:
+                return Response({"message": INVALID_DATE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
 
         if end_date:
-            response = is_invalid_date(end_date)
-            if response:
-                return response
+            end_date = parse_date(end_date)
+            if end_date is None:
+                return Response({"message": INVALID_DATE_MESSAGE}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = is_invalid_page_size(page_size)
+        if response:
+            return response
+
+        months = get_months_between(start_date, end_date)
+        cache_key = get_response_cache_key("expenses", query_params, [("expenses", months)])
+        response = get_cached_response(cache_key)
+        if response:
+            return get_not_modified_response(request, response.headers) or response
 
         initial_query = get_expenses_initial_query(item_name, start_date, end_date, added_by)
 
-        result_qs = initial_query.values(
-            "item_name", "item_price", "added_by", "item_quantity", "date_added", "unique_id", "total_price"
-        ).order_by("-date_added", "-total_price")
+        validator_headers = get_validator_headers(initial_query)
+        response = get_not_modified_response(request, validator_headers)
+        if response:
+            return response
 
-        response_dict["expenses"] = result_qs
+        fields = ("item_name", "item_price", "added_by", "item_quantity", "date_added", "unique_id", "total_price")
+        paginated = is_pagination_requested(query_params)
 
-        total_expenses = result_qs.aggregate(total_expenses=Sum("total_price"))["total_expenses"]
-        response_dict["total_expenses"] = total_expenses
+        def list_expenses():
+            if paginated:
+                return paginate_queryset(initial_query, EXPENSES_ORDERING, fields, cursor, get_page_size(page_size))
+            return list(initial_query.values(*fields).order_by(*EXPENSES_ORDERING)), None
+
+        # The listing and the aggregates are independent queries
+        queries = [lambda: aggregate_expenses(initial_query)]
+        if include_expenses:
+            queries.append(list_expenses)
+        try:
+            (total_expenses, expense_per_item), *listing = run_concurrently(*queries)
+        except ValidationError:
+            return Response({"message": "Provide a valid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
-        expense_per_item = aggregate_expenses_qs(result_qs, total_expenses)
+        if listing:
+            response_dict["expenses"], next_cursor = listing[0]
+            if paginated:
+                response_dict["next_cursor"] = next_cursor
+
+        response_dict["total_expenses"] = total_expenses
         response_dict["expense_per_item"] = expense_per_item
 
-        return Response({"response": response_dict})
+        response = Response({"response": response_dict}, headers=validator_headers)
+        cache_response(cache_key, response)
+        return response
 
     def post(self, request):
         query_params = request.query_params
@@ -61,22 +132,9 @@ class ListCreateExpenses(APIView):
         item_quantity = query_params.get("item_quantity")
         added_by = request.user.name
 
-        if not all((item_name, item_price)):
-            return Response(
-                {"message": "Both item_name and item_price are required"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if not item_price.isdigit() or int(item_price) < 0:
-            return Response({"message": "Provide a valid item price value"}, status=status.HTTP_400_BAD_REQUEST)
-
-        if date_added:
-            response = is_invalid_date(date_added)
-            if response:
-                return response
-
-        if item_quantity:
-            if not item_quantity.isdigit() or int(item_quantity) < 1:
-                return Response({"message": "Provide a valid item quantity value"}, status=status.HTTP_400_BAD_REQUEST)
+        error, date_added = validate_expense(item_name, item_price, date_added, item_quantity)
+        if error:
+            return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
 
         expenses = Expenses(added_by=added_by, item_name=item_name.lower(), item_price=item_price)
 
@@ -86,15 +144,21 @@ class ListCreateExpenses(APIView):
             expenses.item_quantity = item_quantity
 
         expenses.save()
+        invalidate("expenses", [expenses.date_added])
 
         return Response({"message": f"Expense has been saved for {item_name}"}, status=status.HTTP_200_OK)
 
     def delete(self, request):
         query_params = request.query_params
+        if is_bulk_delete(query_params, EXPENSES_FILTERS):
+            return self.bulk_delete(request)
+
         unique_id = query_params.get("unique_id")
         if unique_id:
             try:
-                Expenses.objects.get(unique_id=unique_id).delete()
+                expense = Expenses.objects.get(unique_id=unique_id)
+                expense.delete()
+                invalidate("expenses", [expense.date_added])
                 response = f"Expense {unique_id} has been deleted"
                 status_ = status.HTTP_200_OK
             except ObjectDoesNotExist:
@@ -108,3 +172,120 @@ class ListCreateExpenses(APIView):
             status_ = status.HTTP_400_BAD_REQUEST
 
         return Response({"message": response}, status=status_)
+
+    def bulk_delete(self, request):
+        """
+        Delete every expense of the unique_ids and matching the filters with one DELETE statement.
+
+        With dry_run=true nothing is deleted, the response tells what would be.
+        """
+        query_params = request.query_params
+
+        start_date = query_params.get("start_date")
+        end_date = query_params.get("end_date")
+        dry_run = query_params.get("dry_run", "false").lower() == "true"
+        unique_ids = get_unique_ids(query_params)
+
+        for date in (start_date, end_date):
+            if date:
+                response = is_invalid_date(date)
+                if response:
+                    return response
+
+        response = is_invalid_unique_ids(unique_ids)
+        if response:
+            return response
+
+        queryset = get_expenses_initial_query(
+            query_params.get("item_name"), start_date, end_date, query_params.get("added_by")
+        )
+        if unique_ids:
+            queryset = queryset.filter(unique_id__in=unique_ids)
+
+        return delete_in_bulk("expenses", queryset, "date_added", unique_ids, dry_run)
+
+
+class BulkCreateExpenses(AtomicWritesMixin, APIView):
+    """
+    View to create many expenses at once.
+    """
+
+    def post(self, request):
+        """
+        Create the expenses of a JSON array or CSV body in one transaction.
+
+        Every row is validated first. Unless allow_partial=true is given, a single invalid row rejects the
+        whole batch, otherwise the valid rows are saved and the errors of the others are returned.
+        """
+        allow_partial = request.query_params.get("allow_partial", "false").lower() == "true"
+
+        if request.content_type.startswith("text/csv"):
+            try:
+                rows = list(csv.DictReader(io.StringIO(request.body.decode())))
+            except (UnicodeDecodeError, csv.Error):
+                return Response({"message": "Provide a valid CSV body"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data
+
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"message": "Provide a non-empty JSON array or CSV body of expenses"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(rows) > MAX_BULK_EXPENSES:
+            return Response(
+                {"message": f"At most {MAX_BULK_EXPENSES} expenses can be created at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The validated rows, holding their parsed date
+        valid_rows: list[dict] = []
+        errors = []
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append({"row": index, "message": "Each expense must be an object"})
+                continue
+
+            values = {field: row.get(field) for field in ("item_name", "item_price", "date", "item_quantity")}
+            values = {field: str(value) if value not in (None, "") else None for field, value in values.items()}
+
+            error, values["date"] = validate_expense(
+                values["item_name"], values["item_price"], values["date"], values["item_quantity"]
+            )
+            if error:
+                errors.append({"row": index, "message": error})
+            else:
+                valid_rows.append(values)
+
+        if errors and not allow_partial:
+            return Response(
+                {"message": "No expenses have been saved", "errors": errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        item_prices = [int(row["item_price"]) for row in valid_rows]
+        item_quantities = [int(row["item_quantity"] or 1) for row in valid_rows]
+        today = datetime.date.today()
+        dates = [row["date"] or today for row in valid_rows]
+
+        expenses = [
+            Expenses(
+                added_by=request.user.name,
+                item_name=row["item_name"].lower(),
+                item_price=item_price,
+                item_quantity=item_quantity,
+                date_added=date_added,
+            )
+            for row, item_price, item_quantity, date_added in zip(valid_rows, item_prices, item_quantities, dates)
+        ]
+
+        with transaction.atomic():
+            Expenses.objects.bulk_create(expenses, batch_size=BULK_CREATE_BATCH_SIZE)
+            # bulk_create() does not go through Expenses.save(), which maintains the rollups
+            MonthlyBudgetRollup.objects.refresh_months(dates)
+            invalidate("expenses", dates)
+
+        return Response(
+            {"message": f"{len(expenses)} expenses have been saved", "created": len(expenses), "errors": errors},
+            status=status.HTTP_200_OK,
+        )
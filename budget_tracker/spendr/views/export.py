@@ -0,0 +1,111 @@
+import csv
+import io
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from budget_tracker.spendr.pagination import CONTRIBUTIONS_ORDERING, EXPENSES_ORDERING
+from budget_tracker.spendr.utils import (
+    AtomicWritesMixin,
+    get_contribution_initial_query,
+    get_expenses_initial_query,
+    is_invalid_date,
+    is_invalid_year_month,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPENSES_FIELDS = ("unique_id", "date_added", "item_name", "item_price", "item_quantity", "total_price", "added_by")
+CONTRIBUTIONS_FIELDS = ("unique_id", "contribution_date", "contributor_name", "contribution_amount")
+
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def stream_csv(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(fields, rows):
+    encoder = DjangoJSONEncoder()
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(fields, row))))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+class ExportData(AtomicWritesMixin, APIView):
+    """
+    View to export expenses or contributions.
+    """
+
+    def get(self, request):
+        """
+        Stream every expense or contribution matching the filters as CSV or NDJSON.
+        """
+        query_params = request.query_params
+
+        resource = query_params.get("resource", "expenses")
+        export_format = query_params.get("export_format", "csv")
+
+        if resource not in ("expenses", "contributions"):
+            return Response(
+                {"message": "resource must be one of: expenses, contributions"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if export_format not in CONTENT_TYPES:
+            return Response(
+                {"message": "export_format must be one of: csv, ndjson"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if resource == "expenses":
+            start_date = query_params.get("start_date")
+            end_date = query_params.get("end_date")
+
+            for date in (start_date, end_date):
+                if date:
+                    response = is_invalid_date(date)
+                    if response:
+                        return response
+
+            queryset = get_expenses_initial_query(
+                query_params.get("item_name"), start_date, end_date, query_params.get("added_by")
+            ).order_by(*EXPENSES_ORDERING)
+            fields: tuple[str, ...] = EXPENSES_FIELDS
+        else:
+            start_year_month = query_params.get("start_year_month")
+            end_year_month = query_params.get("end_year_month")
+
+            for year_month in (start_year_month, end_year_month):
+                if year_month:
+                    response = is_invalid_year_month(year_month)
+                    if response:
+                        return response
+
+            queryset = get_contribution_initial_query(
+                query_params.get("contributor"), start_year_month, end_year_month
+            ).order_by(*CONTRIBUTIONS_ORDERING)
+            fields = CONTRIBUTIONS_FIELDS
+
+        # iterator() reads the rows through a server-side cursor chunk by chunk, nothing is cached on the queryset
+        rows = queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        stream = stream_csv(fields, rows) if export_format == "csv" else stream_ndjson(fields, rows)
+
+        response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[export_format])
+        response["Content-Disposition"] = f'attachment; filename="{resource}.{export_format}"'
+        return response
@@ -0,0 +1,126 @@
+"""
+Token authentication without a database query per request.
+
+Authenticated tokens are kept in two layers:
+
+- a bounded LRU of this process, checked first and expiring after a few seconds,
+- the default cache (Redis in production), shared by every worker.
+
+Revoking a token, or saving or deleting its user, removes it from the shared cache and from the LRU of the
+process doing it. The LRUs of the other processes are not reachable and keep serving the entry for at
+most ``LOCAL_TIMEOUT`` seconds.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+KEY_PREFIX = "auth:token"
+SHARED_TIMEOUT = 5 * 60
+LOCAL_TIMEOUT = 10
+LOCAL_MAX_SIZE = 1024
+
+
+def get_cache_key(key):
+    # Raw tokens are credentials, they are not written to the cache
+    return f"{KEY_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+class LocalCache:
+    """Bounded LRU of pickled values, safe to share between the threads of a process."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LocalCache(LOCAL_MAX_SIZE, LOCAL_TIMEOUT)
+
+
+def invalidate_tokens(keys):
+    """
+    Forget the cached tokens of ``keys``, now and again once the current transaction commits.
+
+    The second pass removes an entry cached from the old rows by a request running before the commit.
+    """
+    cache_keys = [get_cache_key(key) for key in keys]
+    if not cache_keys:
+        return
+
+    def delete():
+        cache.delete_many(cache_keys)
+        for cache_key in cache_keys:
+            local_cache.delete(cache_key)
+
+    delete()
+    transaction.on_commit(delete)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    DRF token authentication reading the token and its user from the caches before the database.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_cache_key(key)
+
+        # Values are unpickled on every hit so that requests never share a user instance
+        value = local_cache.get(cache_key)
+        if value is None:
+            value = cache.get(cache_key)
+            if value is None:
+                value = self.get_token(key)
+                cache.set(cache_key, value, SHARED_TIMEOUT)
+            local_cache.set(cache_key, value)
+
+        token = pickle.loads(value)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return token.user, token
+
+    def get_token(self, key):
+        model = self.get_model()
+        try:
+            # The password hash is not needed to authenticate and must not be copied to the caches. Left
+            # deferred, it is only read if asked for and a save of the user does not write it back.
+            token = model.objects.select_related("user").defer("user__password").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        return pickle.dumps(token)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from budget_tracker.users.authentication import invalidate_tokens
+
+
+@receiver(post_delete, sender=Token)
+def forget_revoked_token(sender, instance, **kwargs):
+    invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    # Logging in only touches last_login, which the cached users do not need
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_tokens(Token.objects.filter(user=instance).values_list("key", flat=True))
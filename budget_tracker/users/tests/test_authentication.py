@@ -0,0 +1,111 @@
+import pickle
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from budget_tracker.users.authentication import CachedTokenAuthentication, LocalCache, get_cache_key, local_cache
+from budget_tracker.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_token_caches():
+    cache.clear()
+    local_cache.clear()
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    return Token.objects.create(user=user)
+
+
+def get_me(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("api:user-me"))
+    return response, [query["sql"] for query in context.captured_queries if "authtoken_token" in query["sql"]]
+
+
+class TestCachedTokenAuthentication:
+    def test_token_queried_once(self, token: Token):
+        response, token_queries = get_me(token)
+        assert response.status_code == 200
+        assert len(token_queries) == 1
+
+        response, token_queries = get_me(token)
+        assert response.status_code == 200
+        assert response.data["name"] == token.user.name
+        assert token_queries == []
+
+    def test_password_not_cached(self, token: Token):
+        get_me(token)
+
+        value = cache.get(get_cache_key(token.key))
+        assert token.user.password
+        assert token.user.password.encode() not in value
+        assert "password" not in pickle.loads(value).user.__dict__
+
+        # nor lost when the cached user is saved
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token.key)
+        user.name = "renamed"
+        user.save()
+        assert User.objects.get(pk=user.pk).password == token.user.password
+
+    def test_shared_cache_used_by_other_processes(self, token: Token):
+        get_me(token)
+        local_cache.clear()
+
+        response, token_queries = get_me(token)
+        assert response.status_code == 200
+        assert token_queries == []
+
+    def test_invalid_token(self, user: User):
+        response, _ = get_me(Token(key="invalid", user=user))
+        assert response.status_code == 403
+
+    def test_revoked_token(self, token: Token):
+        get_me(token)
+        token.delete()
+
+        response, _ = get_me(token)
+        assert response.status_code == 403
+
+    def test_deactivated_user(self, token: Token):
+        get_me(token)
+        token.user.is_active = False
+        token.user.save()
+
+        response, _ = get_me(token)
+        assert response.status_code == 403
+
+    def test_renamed_user(self, token: Token):
+        get_me(token)
+        token.user.name = "renamed"
+        token.user.save(update_fields=["name"])
+
+        response, _ = get_me(token)
+        assert response.data["name"] == "renamed"
+
+
+class TestLocalCache:
+    def test_least_recently_used_evicted(self):
+        local = LocalCache(max_size=2, timeout=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert (local.get("a"), local.get("b"), local.get("c")) == (1, None, 3)
+
+    def test_expired(self):
+        local = LocalCache(max_size=2, timeout=-1)
+        local.set("a", 1)
+
+        assert local.get("a") is None
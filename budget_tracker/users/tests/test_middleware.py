@@ -0,0 +1,54 @@
+import pytest
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from budget_tracker.users.models import User
+from budget_tracker.utils.middleware import SessionMiddleware, is_token_request
+
+pytestmark = pytest.mark.django_db
+
+
+class TestIsTokenRequest:
+    @pytest.mark.parametrize(
+        "path, headers, expected",
+        [
+            ("/spendr/expenses", {"HTTP_AUTHORIZATION": "Token abc"}, True),
+            ("/api/users/me/", {"HTTP_AUTHORIZATION": "Token abc"}, True),
+            ("/spendr/expenses", {}, False),
+            ("/spendr/expenses", {"HTTP_AUTHORIZATION": "Basic abc"}, False),
+            ("/users/~redirect/", {"HTTP_AUTHORIZATION": "Token abc"}, False),
+        ],
+    )
+    def test_paths_and_headers(self, rf: RequestFactory, path, headers, expected):
+        assert is_token_request(rf.get(path, **headers)) is expected
+
+
+class TestSkipForTokenRequests:
+    def test_no_session_for_token_requests(self, rf: RequestFactory):
+        middleware = SessionMiddleware(lambda request: request)
+
+        assert not hasattr(middleware(rf.get("/spendr/expenses", HTTP_AUTHORIZATION="Token abc")), "session")
+        assert hasattr(middleware(rf.get("/spendr/expenses")), "session")
+
+    def test_token_request(self, user: User):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+
+        response = client.get(reverse("api:user-me"))
+
+        assert response.status_code == 200
+        assert response.data["name"] == user.name
+        # LocaleMiddleware did not run
+        assert "Content-Language" not in response.headers
+
+    def test_session_request(self, user: User):
+        client = APIClient()
+        client.force_login(user)
+
+        response = client.get(reverse("api:user-me"))
+
+        assert response.status_code == 200
+        assert response.data["name"] == user.name
+        assert "Content-Language" in response.headers
@@ -0,0 +1,50 @@
+"""
+Django middleware skipped by token authenticated API requests.
+
+Sessions, messages, the active language and CSRF cookies only matter to browsers. API clients sending a
+DRF token to ``TOKEN_PATH_PREFIXES`` get none of them, and their requests go straight to the next
+middleware. DRF sets ``request.user`` itself once the token is authenticated.
+"""
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.middleware import csrf, locale
+from django.utils.deprecation import MiddlewareMixin
+
+TOKEN_PATH_PREFIXES = ("/spendr/", "/api/")
+
+
+def is_token_request(request):
+    authorization = request.headers.get("Authorization", "")
+    return request.path_info.startswith(TOKEN_PATH_PREFIXES) and authorization.startswith("Token ")
+
+
+class SkipForTokenRequestsMixin(MiddlewareMixin):
+    def __call__(self, request):
+        # Returns the coroutine of the next middleware as is when served over ASGI
+        if is_token_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SkipForTokenRequestsMixin, sessions_middleware.SessionMiddleware):
+    pass
+
+
+class LocaleMiddleware(SkipForTokenRequestsMixin, locale.LocaleMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SkipForTokenRequestsMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_token_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(SkipForTokenRequestsMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(SkipForTokenRequestsMixin, messages_middleware.MessageMiddleware):
+    pass
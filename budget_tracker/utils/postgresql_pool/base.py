@@ -0,0 +1,205 @@
+"""
+PostgreSQL backend taking its connections from a pool shared by the threads of the process.
+
+Enabled with ``"ENGINE": "budget_tracker.utils.postgresql_pool"`` and ``CONN_MAX_AGE = 0``: Django then
+closes its connection at the end of every request, which hands it back to the pool instead. The
+``POOL`` entry of the database settings sets the pool up:
+
+- ``MIN_SIZE``: idle connections kept open however long they stay unused,
+- ``MAX_SIZE``: connections open at most, requests wait for one beyond that,
+- ``TIMEOUT``: seconds to wait for a connection before raising ``OperationalError``,
+- ``CHECK_INTERVAL``: connections idle for longer are checked with ``SELECT 1`` before reuse,
+- ``IDLE_TIMEOUT``: connections above ``MIN_SIZE`` idle for longer are closed,
+- ``MAX_LIFETIME``: connections older than this are closed instead of reused.
+"""
+import collections
+import os
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+from django.db.backends.postgresql import base
+
+Database = psycopg2
+
+DEFAULT_POOL_SETTINGS = {
+    "MIN_SIZE": 2,
+    "MAX_SIZE": 10,
+    "TIMEOUT": 10,
+    "CHECK_INTERVAL": 30,
+    "IDLE_TIMEOUT": 60,
+    "MAX_LIFETIME": 60 * 60,
+}
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection remembering when it was opened and last handed back to the pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened_at = self.returned_at = time.monotonic()
+        self.prepared = False
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of the connections to one database, handing out the most recently used one first.
+    """
+
+    def __init__(self, conn_params, min_size, max_size, timeout, check_interval, idle_timeout, max_lifetime):
+        self.conn_params = conn_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+
+        self.pid = os.getpid()
+        self.idle: collections.deque[PooledConnection] = collections.deque()
+        # Connections open, idle or handed out
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def connect(self):
+        return Database.connect(**self.conn_params, connection_factory=PooledConnection)
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Database.OperationalError(
+                            f"No database connection available after {self.timeout}s, "
+                            f"all {self.max_size} are in use"
+                        )
+                    self.condition.wait(remaining)
+
+                connection = self.idle.pop() if self.idle else None
+                if connection is None:
+                    self.size += 1
+
+            if connection is None:
+                try:
+                    return self.connect()
+                except Database.Error:
+                    self.forget()
+                    raise
+
+            if self.is_healthy(connection):
+                return connection
+            self.discard(connection)
+
+    def putconn(self, connection):
+        if connection.closed or self.is_expired(connection):
+            self.discard(connection)
+            return
+
+        status = connection.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            self.discard(connection)
+            return
+        if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Database.Error:
+                self.discard(connection)
+                return
+
+        connection.returned_at = time.monotonic()
+        with self.condition:
+            self.idle.append(connection)
+            stale = self.get_stale_connections()
+            self.condition.notify()
+
+        for stale_connection in stale:
+            self.discard(stale_connection)
+
+    def get_stale_connections(self):
+        # The least recently used connections are at the left end
+        stale = []
+        while len(self.idle) > self.min_size and self.idle[0].returned_at < time.monotonic() - self.idle_timeout:
+            stale.append(self.idle.popleft())
+        return stale
+
+    def is_expired(self, connection):
+        return connection.opened_at < time.monotonic() - self.max_lifetime
+
+    def is_healthy(self, connection):
+        if connection.closed or self.is_expired(connection):
+            return False
+        if connection.returned_at >= time.monotonic() - self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not connection.autocommit:
+                connection.rollback()
+        except Database.Error:
+            return False
+        return True
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Database.Error:
+            pass
+        self.forget()
+
+    def forget(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+
+_pools: dict[tuple[str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, pool_settings):
+    """
+    Return the pool of the database ``alias`` connected with ``conn_params``, created on first use.
+    """
+    key = (alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        # Connections cannot be shared with the processes forked after they were opened
+        if pool is None or pool.pid != os.getpid():
+            pool_settings = {**DEFAULT_POOL_SETTINGS, **pool_settings}
+            pool = _pools[key] = ConnectionPool(
+                conn_params, **{name.lower(): value for name, value in pool_settings.items()}
+            )
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Set along with the connection, which _close() hands back to it
+    pool: ConnectionPool
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, conn_params, self.settings_dict.get("POOL", {}))
+        connection = self.pool.getconn()
+
+        # Same setup as the postgresql backend, once per connection
+        options = self.settings_dict["OPTIONS"]
+        if not connection.prepared:
+            if "isolation_level" in options and options["isolation_level"] != connection.isolation_level:
+                connection.set_session(isolation_level=options["isolation_level"])
+            psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+            connection.prepared = True
+        self.isolation_level = options.get("isolation_level", connection.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                if self.in_atomic_block:
+                    # Django keeps referencing a connection closed inside a transaction, it cannot be reused
+                    self.pool.discard(self.connection)
+                else:
+                    self.pool.putconn(self.connection)
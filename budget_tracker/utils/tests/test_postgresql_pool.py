@@ -0,0 +1,112 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from django.db import connection
+
+from budget_tracker.utils.postgresql_pool.base import DEFAULT_POOL_SETTINGS, ConnectionPool, DatabaseWrapper
+
+# The pooled connections are opened next to the one of the test, which only provides the database
+pytestmark = pytest.mark.django_db
+
+
+def get_pool(**pool_settings):
+    pool_settings = {**DEFAULT_POOL_SETTINGS, **pool_settings}
+    return ConnectionPool(connection.get_connection_params(), **{k.lower(): v for k, v in pool_settings.items()})
+
+
+def get_backend_pid(raw_connection):
+    with raw_connection.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        return cursor.fetchone()[0]
+
+
+class TestConnectionPool:
+    def test_reuses_connections(self):
+        pool = get_pool()
+
+        first = pool.getconn()
+        pool.putconn(first)
+
+        assert pool.getconn() is first
+        assert pool.size == 1
+
+    def test_max_size(self):
+        pool = get_pool(MAX_SIZE=1, TIMEOUT=0.1)
+        pool.getconn()
+
+        with pytest.raises(psycopg2.OperationalError):
+            pool.getconn()
+
+    def test_waits_for_a_connection(self):
+        pool = get_pool(MAX_SIZE=1, TIMEOUT=5)
+        first = pool.getconn()
+
+        timer = threading.Timer(0.1, pool.putconn, [first])
+        timer.start()
+
+        assert pool.getconn() is first
+        timer.join()
+
+    def test_replaces_broken_connections(self):
+        pool = get_pool(CHECK_INTERVAL=0)
+        first = pool.getconn()
+        pid = get_backend_pid(first)
+        pool.putconn(first)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+        time.sleep(0.1)
+
+        second = pool.getconn()
+        assert second is not first
+        assert get_backend_pid(second) != pid
+        assert pool.size == 1
+
+    def test_max_lifetime(self):
+        pool = get_pool(MAX_LIFETIME=0)
+        first = pool.getconn()
+        pool.putconn(first)
+
+        assert first.closed
+        assert pool.size == 0
+
+    def test_closes_idle_connections_above_min_size(self):
+        pool = get_pool(MIN_SIZE=1, IDLE_TIMEOUT=0)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+
+        assert first.closed
+        assert list(pool.idle) == [second]
+
+    def test_rolls_back_returned_connections(self):
+        pool = get_pool()
+        first = pool.getconn()
+        with first.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        assert first.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+        pool.putconn(first)
+
+        assert first.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class TestDatabaseWrapper:
+    def test_close_returns_the_connection(self):
+        settings_dict = {**connection.settings_dict, "POOL": {"MAX_SIZE": 1}}
+        wrapper = DatabaseWrapper(settings_dict, alias="pooled")
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        first = wrapper.connection
+        wrapper.close()
+
+        assert wrapper.connection is None
+        assert not first.closed
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        assert wrapper.connection is first
+        wrapper.close()
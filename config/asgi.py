@@ -0,0 +1,30 @@
+"""
+ASGI config for budget_tracker project.
+
+It exposes the ASGI callable as a module-level variable named ``application``. Every request goes to
+Django, except the spendr event stream which is served by its own asynchronous handler so that open
+streams do not hold a thread each.
+"""
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# budget_tracker directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "budget_tracker"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# Set up Django before importing code that uses models
+django_application = get_asgi_application()
+
+from budget_tracker.spendr.events import EVENTS_PATH, stream_events  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == EVENTS_PATH:
+        await stream_events(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
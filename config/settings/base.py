@@ -40,6 +40,13 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas of the default database, as a comma separated list of URLs, read by the spendr GET endpoints
+SPENDR_REPLICA_DATABASES = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    DATABASES[f"replica_{index}"] = {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+    SPENDR_REPLICA_DATABASES.append(f"replica_{index}")
+# https://docs.djangoproject.com/en/dev/ref/settings/#database-routers
+DATABASE_ROUTERS = ["budget_tracker.spendr.routers.ReplicaRouter"]
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -122,15 +129,17 @@ AUTH_PASSWORD_VALIDATORS = [
 # MIDDLEWARE
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
+# The session, locale, CSRF, authentication and messages middleware are skipped by token authenticated
+# API requests, see budget_tracker.utils.middleware
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
+    "budget_tracker.utils.middleware.SessionMiddleware",
+    "budget_tracker.utils.middleware.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "budget_tracker.utils.middleware.CsrfViewMiddleware",
+    "budget_tracker.utils.middleware.AuthenticationMiddleware",
+    "budget_tracker.utils.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -199,6 +208,9 @@ FIXTURE_DIRS = (str(APPS_DIR / "fixtures"),)
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-httponly
 SESSION_COOKIE_HTTPONLY = True
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# Sessions are read from the cache (Redis in production) and written through to the database
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 # https://docs.djangoproject.com/en/dev/ref/settings/#csrf-cookie-httponly
 CSRF_COOKIE_HTTPONLY = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#x-frame-options
@@ -275,7 +287,7 @@ SOCIALACCOUNT_FORMS = {"signup": "budget_tracker.users.forms.UserSocialSignupFor
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "budget_tracker.users.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -285,6 +297,16 @@ REST_FRAMEWORK = {
 CORS_URLS_REGEX = r"^/api/.*$"
 
 
+# spendr
+# ------------------------------------------------------------------------------
+# Redis instance whose pub/sub fans the change events out to the ASGI workers, empty to disable the push
+SPENDR_EVENTS_REDIS_URL = env("REDIS_URL", default="")
+# Run the independent queries of a request concurrently, each on a connection of its own. Only worth it with
+# the pooled backend, the connections would otherwise be opened and closed for every request.
+SPENDR_CONCURRENT_QUERIES = env.bool("SPENDR_CONCURRENT_QUERIES", default=False)
+# Threads per worker process running those queries
+SPENDR_QUERY_THREADS = env.int("SPENDR_QUERY_THREADS", default=4)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "budget_tracker API",
     "DESCRIPTION": "Documentation of API endpoints of budget_tracker",
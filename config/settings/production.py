@@ -10,7 +10,20 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa: F405
+for database in DATABASES.values():  # noqa: F405
+    database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# A pool of connections per worker process, shared by its threads, instead of one connection per thread
+if env.bool("DATABASE_POOL", default=False):
+    for database in DATABASES.values():  # noqa: F405
+        database["ENGINE"] = "budget_tracker.utils.postgresql_pool"
+        # Connections go back to the pool at the end of every request
+        database["CONN_MAX_AGE"] = 0
+        database["POOL"] = {
+            "MIN_SIZE": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+            "MAX_SIZE": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            "TIMEOUT": env.int("DATABASE_POOL_TIMEOUT", default=10),
+        }
+    SPENDR_CONCURRENT_QUERIES = env.bool("SPENDR_CONCURRENT_QUERIES", default=True)
 
 # CACHES
 # ------------------------------------------------------------------------------